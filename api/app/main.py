@@ -1,19 +1,76 @@
+import time
+_import_started = time.perf_counter()
+
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI, Request
 from fastapi.responses import JSONResponse
 from fastapi.middleware.cors import CORSMiddleware
-from .routers import assets, analysis
+from .routers import assets, analysis, alerts, history, admin
+from .services import startup, rate_limit, profiling
+
+startup.mark_import_started(_import_started)
 
-app = FastAPI(title="Portfolio Tracker API", description="API for fetching real-time financial data using yfinance.")
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Optional background warm-up (WARMUP_ON_STARTUP=1); does not delay serving
+    startup.start_warmup()
+    yield
+
+app = FastAPI(title="Portfolio Tracker API", description="API for fetching real-time financial data using yfinance.", lifespan=lifespan)
 
 # Global Exception Handler
 @app.exception_handler(Exception)
 async def global_exception_handler(request: Request, exc: Exception):
-    print(f"INTERNAL ERROR: {exc}") 
+    print(f"INTERNAL ERROR: {exc}")
     return JSONResponse(
         status_code=500,
         content={"detail": "Internal Server Error. Please contact support."}
     )
 
+# On-demand request profiling (only installed when PROFILE_ADMIN_TOKEN is set)
+async def profile_requests(request: Request, call_next):
+    trigger = profiling.should_profile(request)
+    sampler = profiling.start(trigger) if trigger else None
+    if sampler is None:
+        return await call_next(request)
+    status_code = 500
+    try:
+        response = await call_next(request)
+        status_code = response.status_code
+    finally:
+        profile_id = profiling.finish(sampler, request, status_code)
+    response.headers["X-Profile-Id"] = str(profile_id)
+    return response
+
+if profiling.PROFILING_ENABLED:
+    app.middleware("http")(profile_requests)
+
+# Rate limiting / admission control (registered before CORS so 429s carry CORS headers)
+@app.middleware("http")
+async def limit_requests(request: Request, call_next):
+    if not rate_limit.RATE_LIMIT_ENABLED or request.method == "OPTIONS":
+        return await call_next(request)
+
+    cls = rate_limit.route_class(request.url.path)
+    wait = rate_limit.take(rate_limit.client_id(request), cls)
+    if wait:
+        return JSONResponse(
+            status_code=429,
+            content={"detail": "Too many requests. Please slow down."},
+            headers={"Retry-After": rate_limit.retry_after_header(wait)}
+        )
+    if not rate_limit.acquire_slot(cls):
+        return JSONResponse(
+            status_code=429,
+            content={"detail": "Server busy. Please retry shortly."},
+            headers={"Retry-After": "1"}
+        )
+    try:
+        return await call_next(request)
+    finally:
+        rate_limit.release_slot(cls)
+
 # CORS
 app.add_middleware(
     CORSMiddleware,
@@ -21,13 +78,31 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["Retry-After", "X-Missing-Sources", "X-Profile-Id"],
 )
 
+# Time-to-first-request measurement
+@app.middleware("http")
+async def record_first_request(request: Request, call_next):
+    response = await call_next(request)
+    startup.mark_request_served()
+    return response
+
 # Health Check
 @app.get("/")
 def read_root():
     return {"status": "ok", "message": "Portfolio Tracker API is running"}
 
+# Startup timings (import time, time-to-first-request, warm-up progress)
+@app.get("/startup")
+def read_startup_metrics():
+    return startup.STARTUP_METRICS
+
 # Include Routers
 app.include_router(assets.router, prefix="/api")
 app.include_router(analysis.router)
+app.include_router(alerts.router, prefix="/api")
+app.include_router(history.router, prefix="/api")
+app.include_router(admin.router, prefix="/api")
+
+startup.mark_import_finished()
@@ -5,6 +5,9 @@ This module defines the data models used for:
 - Portfolio analysis requests
 - News analysis requests  
 - Chat conversation requests
+- Batch symbol resolution requests
+- Price alert registration
+- Portfolio history snapshots
 """
 
 from pydantic import BaseModel
@@ -25,12 +28,14 @@ class PortfolioAnalysisRequest(BaseModel):
     mode: Optional[str] = "The Balanced"
     language: Optional[str] = "en"
     model: Optional[str] = "qwen/qwen3-32b"
+    clientId: Optional[str] = None  # scopes the analysis cache; no caching without it
 
 class NewsItem(BaseModel):
     title: str
     publisher: Optional[str] = "Unknown"
     link: Optional[str] = None
     summary: Optional[str] = None
+    sourceCount: Optional[int] = 1  # publishers carrying this story (news clustering)
 
 class NewsAnalysisRequest(BaseModel):
     news: List[NewsItem]
@@ -51,3 +56,21 @@ class ChatRequest(BaseModel):
     history: Optional[List[ChatMessage]] = []
     model: Optional[str] = "qwen/qwen3-32b"
     language: Optional[str] = "en"
+
+class SymbolResolveRequest(BaseModel):
+    symbols: List[str]  # raw tickers or company names, e.g. from a broker CSV
+
+class AlertCreateRequest(BaseModel):
+    clientId: str
+    symbol: str
+    kind: str  # 'above', 'below', 'move' (% since creation) or 'dayChange' (% vs previous close)
+    threshold: float
+    basePrice: Optional[float] = None  # reference price for 'move'; defaults to the latest quote
+
+class HistoryPoint(BaseModel):
+    timestamp: float  # unix milliseconds
+    value: float
+
+class HistoryAppendRequest(BaseModel):
+    clientId: str
+    points: List[HistoryPoint]
@@ -0,0 +1,27 @@
+"""
+Admin Router
+
+Operator endpoints (require `X-Admin-Token` = PROFILE_ADMIN_TOKEN):
+- List captured request profiles
+- Download a profile as collapsed stacks for flame graph tools
+"""
+
+from typing import Optional
+
+from fastapi import APIRouter, Header
+from fastapi.responses import PlainTextResponse
+
+from ..services import profiling
+
+router = APIRouter()
+
+@router.get("/admin/profiles")
+def list_profiles(x_admin_token: Optional[str] = Header(None)):
+    profiling.require_admin(x_admin_token)
+    return profiling.list_profiles()
+
+@router.get("/admin/profiles/{profile_id}", response_class=PlainTextResponse)
+def get_profile(profile_id: int, x_admin_token: Optional[str] = Header(None)):
+    """Collapsed stacks (`flamegraph.pl`, speedscope, inferno)"""
+    profiling.require_admin(x_admin_token)
+    return profiling.collapsed(profile_id)
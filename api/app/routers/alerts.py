@@ -0,0 +1,49 @@
+"""
+Alerts Router
+
+API endpoints for server-side price alerts:
+- Register, list and delete alerts
+- Server-Sent Events stream of triggered alerts
+- Recent triggered alerts (polling fallback)
+"""
+
+from typing import Optional
+
+from fastapi import APIRouter, Header
+from fastapi.responses import StreamingResponse
+
+from ..services import alerts
+from ..models import AlertCreateRequest
+
+router = APIRouter()
+
+@router.post("/alerts")
+def create_alert(request: AlertCreateRequest):
+    return alerts.add_alert(request.clientId, request.symbol, request.kind, request.threshold, request.basePrice)
+
+@router.get("/alerts")
+def list_alerts(clientId: str):
+    return alerts.list_alerts(clientId)
+
+@router.delete("/alerts/{alert_id}")
+def delete_alert(alert_id: int, clientId: str):
+    return alerts.remove_alert(clientId, alert_id)
+
+@router.get("/alerts/events")
+def get_alert_events(clientId: str, since: int = 0):
+    """Triggered alerts with an eventId after `since`"""
+    return alerts.recent_events(clientId, since)
+
+@router.get("/alerts/stream")
+async def stream_alerts(clientId: str, since: Optional[int] = None, last_event_id: Optional[str] = Header(None)):
+    """Push channel for triggered alerts (text/event-stream)"""
+    if since is None and last_event_id:
+        try:
+            since = int(last_event_id)
+        except ValueError:
+            pass
+    return StreamingResponse(
+        alerts.event_stream(clientId, since),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
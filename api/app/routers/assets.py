@@ -3,33 +3,47 @@ Assets Router
 
 API endpoints for financial data and AI services:
 - Asset search and info
+- Batch symbol resolution
 - Market news and analysis
 - AI chat and portfolio analysis
 - Economic calendar
 """
 
-from fastapi import APIRouter
+from fastapi import APIRouter, Request, Response
 
-from ..services import finance, ai
-from ..models import NewsAnalysisRequest, ArticleAnalysisRequest, ChatRequest
+from ..services import finance, ai, circuit, market_calendar, rate_limit
+from ..models import NewsAnalysisRequest, ArticleAnalysisRequest, ChatRequest, SymbolResolveRequest
 
 router = APIRouter()
 
 @router.get("/search")
-def search_assets(q: str):
-    return finance.search_assets(q)
+def search_assets(q: str, timeout: float = None):
+    return finance.search_assets(q, timeout)
 
 @router.get("/info")
-def get_asset_info(symbol: str):
-    return finance.get_asset_info(symbol)
+def get_asset_info(symbol: str, timeout: float = None):
+    return finance.get_asset_info(symbol, timeout)
+
+@router.post("/symbols/resolve")
+def resolve_symbols(request: SymbolResolveRequest, http_request: Request, timeout: float = None):
+    """Resolve many raw symbols/names at once (portfolio import)"""
+    rate_limit.charge_items(http_request, len(request.symbols))
+    return finance.resolve_symbols(request.symbols, timeout)
 
 @router.get("/prices")
-def get_current_prices(symbols: str):
-    return finance.get_current_prices(symbols)
+def get_current_prices(symbols: str, request: Request, timeout: float = None):
+    """Quotes per symbol; `status` is ok, stale, missing or unavailable"""
+    rate_limit.charge_items(request, symbols.count(",") + 1)
+    return finance.get_current_prices(symbols, timeout)
 
 @router.get("/news")
-def get_market_news(category: str = "general", symbol: str = None, page: int = 0):
-    return finance.get_market_news(category, symbol, page)
+def get_market_news(response: Response, category: str = "general", symbol: str = None, page: int = 0,
+                    cluster: bool = True, timeout: float = None):
+    missing = []
+    news = finance.get_market_news(category, symbol, page, cluster, timeout, missing)
+    if missing:
+        response.headers["X-Missing-Sources"] = ",".join(missing)
+    return news
 
 @router.post("/news/analyze")
 def analyze_news(request: NewsAnalysisRequest):
@@ -45,15 +59,28 @@ def chat(request: ChatRequest):
     return ai.chat(request)
 
 @router.get("/mini-chart")
-def get_mini_chart(symbol: str):
+def get_mini_chart(symbol: str, timeout: float = None):
     """Get mini chart data for ticker tooltip (price, change, sparkline)"""
-    result = finance.get_mini_chart(symbol)
+    result = finance.get_mini_chart(symbol, timeout)
     if result is None:
-        return {"error": "Could not fetch data", "symbol": symbol}
+        if circuit.is_open(circuit.YAHOO, symbol):
+            return {"error": "Could not fetch data", "symbol": symbol, **circuit.unavailable(circuit.YAHOO, symbol)}
+        return {"error": "Could not fetch data", "symbol": symbol, "status": "missing"}
     return result
 
+@router.get("/market-status")
+def get_market_status(symbols: str = ""):
+    """Open/closed state and time to next open per exchange"""
+    symbol_list = [s.strip() for s in symbols.split(',') if s.strip()]
+    return market_calendar.market_status(symbol_list)
+
+@router.get("/circuits")
+def get_circuit_state():
+    """Open per-symbol and per-upstream circuit breakers"""
+    return circuit.get_state()
+
 @router.get("/economic-calendar")
-def get_economic_calendar():
+def get_economic_calendar(timeout: float = None):
     """Get upcoming economic events"""
-    return finance.get_economic_calendar()
+    return finance.get_economic_calendar(timeout)
 
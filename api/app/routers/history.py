@@ -0,0 +1,30 @@
+"""
+History Router
+
+API endpoints for server-side portfolio value history:
+- Append value snapshots
+- Query a time range downsampled to a target point count
+- Delete a client's history
+"""
+
+from typing import Optional
+
+from fastapi import APIRouter
+
+from ..services import history
+from ..models import HistoryAppendRequest
+
+router = APIRouter()
+
+@router.post("/history")
+def append_history(request: HistoryAppendRequest):
+    return history.append_points(request.clientId, [(p.timestamp, p.value) for p in request.points])
+
+@router.get("/history")
+def get_history(clientId: str, start: Optional[float] = None, end: Optional[float] = None, points: int = history.DEFAULT_QUERY_POINTS):
+    """Snapshots between `start` and `end` (unix ms), downsampled with LTTB to `points`"""
+    return history.query(clientId, start, end, points)
+
+@router.delete("/history")
+def delete_history(clientId: str):
+    return history.delete_history(clientId)
@@ -10,10 +10,11 @@ Provides AI-powered analysis functions using the Groq API:
 
 import os
 import re
+from functools import partial
 
-from groq import Groq
 from fastapi import HTTPException
 
+from . import deadline, news_cluster, portfolio_cache
 from ..models import (
     PortfolioAnalysisRequest,
     NewsAnalysisRequest,
@@ -23,18 +24,107 @@ from ..models import (
 
 # --- Configuration ---
 GROQ_API_KEY = os.getenv("GROQ_API_KEY")
+GROQ_TIMEOUT = float(os.getenv("GROQ_TIMEOUT", "60"))  # seconds per Groq call
 DEFAULT_MODEL = "qwen/qwen3-32b"
 
-# Initialize Groq client
-client = Groq(api_key=GROQ_API_KEY)
+# News map-reduce: headlines per LLM call. Chunks run in parallel on the shared
+# LLM pool (deadline.LLM_WORKERS, half of it per request); chunks still
+# running after NEWS_MAP_TIMEOUT are left out of the merge.
+NEWS_CHUNK_SIZE = 20
+NEWS_MAX_CHUNKS = 8
+NEWS_MAP_MAX_TOKENS = 512
+NEWS_MAP_TIMEOUT = 20  # seconds
+
+# Groq client is created on first use (see get_client) to keep imports fast
+_client = None
+
+def get_client():
+    """Return the shared Groq client, importing and constructing it on demand."""
+    global _client
+    if _client is None:
+        from groq import Groq
+        _client = Groq(api_key=GROQ_API_KEY, timeout=GROQ_TIMEOUT)
+    return _client
+
+def _clean_response(content: str) -> str:
+    # Also drops an unclosed <think> block left by a response cut off at max_tokens
+    return re.sub(r'<think>.*?(</think>|$)', '', content or '', flags=re.DOTALL).strip()
+
+def _summarize_news_chunk(lines: list, model: str):
+    """Map step: condense one chunk of headlines into short English notes."""
+    prompt = (
+        "Condense the following market news headlines into at most 6 short bullet points "
+        "covering the main themes, overall sentiment and any notable tickers. "
+        "Plain text, no preamble:\n\n" + "\n".join(lines)
+    )
+    if model.startswith("qwen/qwen3"):
+        prompt += "\n/no_think"  # Qwen3 soft switch: skip reasoning so notes fit NEWS_MAP_MAX_TOKENS
+    try:
+        completion = get_client().chat.completions.create(
+            model=model,
+            messages=[
+                {"role": "system", "content": "You are a financial news analyst who writes terse notes."},
+                {"role": "user", "content": prompt}
+            ],
+            temperature=0.3,
+            max_tokens=NEWS_MAP_MAX_TOKENS,
+            top_p=1,
+            stream=False,
+        )
+        content = completion.choices[0].message.content or ""
+        if "<think>" in content and "</think>" not in content:
+            # Reasoning ran into max_tokens: there are no notes, only partial reasoning
+            print("News chunk summary error: truncated reasoning, chunk dropped")
+            return None
+        return _clean_response(content)
+    except Exception as e:
+        print(f"News chunk summary error: {e}")
+        return None
 
 def analyze_market_news(request: NewsAnalysisRequest):
-    news_text = ""
-    for item in request.news[:20]: # Limit to top 20 to avoid token limits
-        news_text += f"- {item.title} (Source: {item.publisher})\n"
+    # Collapse syndicated duplicates so the budget covers distinct stories
+    clusters = news_cluster.group(request.news, lambda n: n.title, lambda n: n.summary)
+    # At most NEWS_MAX_CHUNKS chunks (one wave on the LLM pool); stories past
+    # the cap are counted and reported instead of silently dropped
+    lines = []
+    for members in clusters[:NEWS_CHUNK_SIZE * NEWS_MAX_CHUNKS]:
+        item = members[0]
+        sources = sum(m.sourceCount or 1 for m in members)
+        more = f", +{sources - 1} more" if sources > 1 else ""
+        lines.append(f"- {item.title} (Source: {item.publisher}{more})")
+
+    model = request.model or "qwen/qwen3-32b"
+
+    if len(lines) <= NEWS_CHUNK_SIZE:
+        analyzed = len(lines)
+        intro = "Analyze the following recent market news headlines and provide a brief, engaging market pulse report:\n\n"
+        news_text = "\n".join(lines) + "\n"
+    else:
+        # Map-reduce: summarize chunks concurrently, then merge the notes below
+        chunks = [lines[i:i + NEWS_CHUNK_SIZE] for i in range(0, len(lines), NEWS_CHUNK_SIZE)]
+        results, _, _ = deadline.gather(
+            {i: partial(_summarize_news_chunk, chunk, model) for i, chunk in enumerate(chunks)},
+            deadline.start(NEWS_MAP_TIMEOUT),
+            pool=deadline.LLM
+        )
+        included = [i for i in sorted(results) if results[i]]
+        partials = [results[i] for i in included]
+        if not partials:
+            raise HTTPException(status_code=500, detail="Groq API Error: failed to summarize news")
+        analyzed = sum(len(chunks[i]) for i in included)
+        intro = (
+            f"The following notes summarize {analyzed} recent market news headlines in {len(partials)} batches. "
+            "Merge them and provide a brief, engaging market pulse report:\n\n"
+        )
+        news_text = "\n\n".join(f"Batch {i + 1}:\n{p}" for i, p in enumerate(partials))
+
+    omitted = len(clusters) - analyzed
+    if omitted:
+        print(f"News analysis: {omitted} of {len(clusters)} stories not analyzed")
+        intro = f"Note: only {analyzed} of {len(clusters)} distinct stories are covered below; mention that the report is based on a subset.\n" + intro
 
     prompt = (
-        "Analyze the following recent market news headlines and provide a brief, engaging market pulse report:\n\n"
+        intro +
         f"{news_text}\n\n"
         "Please provide a structured summary in Markdown format using the following structure:\n\n"
         "### 🚦 Market Sentiment\n"
@@ -55,8 +145,8 @@ def analyze_market_news(request: NewsAnalysisRequest):
         system_instruction += " IMPORTANT: You MUST output the entire response in Thai Language (ภาษาไทย). Translating technical terms is optional but the main content must be Thai."
 
     try:
-        completion = client.chat.completions.create(
-            model=request.model or "qwen/qwen3-32b",
+        completion = get_client().chat.completions.create(
+            model=model,
             messages=[
                 {
                     "role": "system",
@@ -73,9 +163,11 @@ def analyze_market_news(request: NewsAnalysisRequest):
             stream=False,
         )
         
-        content = completion.choices[0].message.content
-        clean_content = re.sub(r'<think>.*?</think>', '', content, flags=re.DOTALL).strip()
-        return {"analysis": clean_content}
+        return {
+            "analysis": _clean_response(completion.choices[0].message.content),
+            "storiesAnalyzed": analyzed,
+            "storiesOmitted": omitted,
+        }
         
     except Exception as e:
         print(f"News Analysis Error: {e}")
@@ -105,7 +197,7 @@ def analyze_article(request: ArticleAnalysisRequest):
         system_instruction += " IMPORTANT: You MUST output the entire response in Thai Language (ภาษาไทย)."
 
     try:
-        completion = client.chat.completions.create(
+        completion = get_client().chat.completions.create(
             model=request.model or "qwen/qwen3-32b",
             messages=[
                 {
@@ -129,7 +221,72 @@ def analyze_article(request: ArticleAnalysisRequest):
         print(f"Article Analysis Error: {e}")
         raise HTTPException(status_code=500, detail=f"Groq API Error: {str(e)}")
 
+PORTFOLIO_STRATEGIES = {
+    "The Defensive": "Prioritize capital preservation and low volatility. Criticize high-risk speculative assets. Favor blue chips, bonds, and consumer staples.",
+    "The Income Portfolio": "Focus on maximizing stable cash flow via dividends and REITs. Criticize low-yield growth stocks.",
+    "The Balanced": "Seek a mix of growth and stability. Ensure moderate risk exposure with decent potential returns.",
+    "The Growth Portfolio": "Prioritize capital appreciation. Tolerate higher volatility for higher returns. Favor tech and expanding sectors.",
+    "The Aggressive Growth Portfolio": "Maximize potential returns with high risk tolerance. Look for moonshots and high-beta assets. Criticize overly safe/low-return allocations."
+}
+
+PORTFOLIO_DELTA_MAX_TOKENS = 768
+
+def _portfolio_completion(system_instruction: str, prompt: str, model: str, max_tokens: int) -> str:
+    try:
+        completion = get_client().chat.completions.create(
+            model=model,
+            messages=[
+                {
+                    "role": "system",
+                    "content": system_instruction
+                },
+                {
+                    "role": "user",
+                    "content": prompt
+                }
+            ],
+            temperature=0.7,
+            max_tokens=max_tokens,
+            top_p=1,
+            stream=False,
+            stop=None,
+        )
+        return _clean_response(completion.choices[0].message.content)
+
+    except Exception as e:
+        print(f"AI Analysis Error: {e}")
+        raise HTTPException(status_code=500, detail=f"Groq API Error: {str(e)}")
+
+def _allocation_changes(old: dict, new: dict) -> str:
+    lines = []
+    for symbol in sorted(old.keys() | new.keys(), key=lambda s: -abs(new.get(s, 0) - old.get(s, 0))):
+        before, after = old.get(symbol, 0) * 100, new.get(symbol, 0) * 100
+        if abs(after - before) < 0.5:
+            continue
+        if not before:
+            lines.append(f"- {symbol}: NEW position, now {after:.1f}%")
+        elif not after:
+            lines.append(f"- {symbol}: SOLD (was {before:.1f}%)")
+        else:
+            lines.append(f"- {symbol}: {before:.1f}% -> {after:.1f}%")
+    return "\n".join(lines) or "- Only minor weight changes (under 0.5% each)"
+
 def analyze_portfolio(request: PortfolioAnalysisRequest):
+    """
+    Full LLM report, reused across small portfolio changes (see portfolio_cache):
+    identical fingerprints return the cached report, near matches get a short
+    delta commentary on top of the closest cached report. Only requests with
+    a clientId are cached, and only against that client's own reports.
+    """
+    model = request.model or DEFAULT_MODEL
+    cacheable = bool(request.clientId)
+    if cacheable:
+        key, weights, scope = portfolio_cache.fingerprint(
+            request.portfolio, request.clientId, request.mode, request.language, model)
+        cached = portfolio_cache.get_exact(key)
+        if cached:
+            return {"analysis": cached["analysis"], "cache": "hit"}
+
     portfolio_summary = ""
     total_value = 0
     
@@ -140,15 +297,29 @@ def analyze_portfolio(request: PortfolioAnalysisRequest):
             f"(Total: ${item.value:.2f}). Sector: {item.sector}, Industry: {item.industry}\n"
         )
     
-    strategies = {
-        "The Defensive": "Prioritize capital preservation and low volatility. Criticize high-risk speculative assets. Favor blue chips, bonds, and consumer staples.",
-        "The Income Portfolio": "Focus on maximizing stable cash flow via dividends and REITs. Criticize low-yield growth stocks.",
-        "The Balanced": "Seek a mix of growth and stability. Ensure moderate risk exposure with decent potential returns.",
-        "The Growth Portfolio": "Prioritize capital appreciation. Tolerate higher volatility for higher returns. Favor tech and expanding sectors.",
-        "The Aggressive Growth Portfolio": "Maximize potential returns with high risk tolerance. Look for moonshots and high-beta assets. Criticize overly safe/low-return allocations."
-    }
-    
-    strategy_instruction = strategies.get(request.mode, strategies["The Balanced"])
+    strategy_instruction = PORTFOLIO_STRATEGIES.get(request.mode, PORTFOLIO_STRATEGIES["The Balanced"])
+
+    system_instruction = "You are an expert financial advisor using Warren Buffett and Ray Dalio principles. You strictly outputs Markdown tables for data comparisons."
+    if request.language == 'th':
+        system_instruction += " IMPORTANT: You MUST output the entire response in Thai Language (ภาษาไทย). Translating technical terms is optional but the main content must be Thai."
+
+    base = portfolio_cache.get_nearest(scope, weights) if cacheable else None
+    if base:
+        # Near match: only describe what changed since the cached report
+        prompt = (
+            f"You recently wrote a full analysis of this investor's portfolio under the '{request.mode}' strategy.\n"
+            f"Strategy Goal: {strategy_instruction}\n\n"
+            f"Allocation changes since then (share of total value):\n{_allocation_changes(base['weights'], weights)}\n\n"
+            f"Current portfolio (Total Value: ${total_value:.2f}):\n{portfolio_summary}\n"
+            "Write a brief update (under 250 words) titled '## 🔄 Update Since Last Analysis':\n"
+            "- How these changes affect diversification and risk\n"
+            "- Whether the previous recommendations still apply, and any adjustment\n"
+            "Use a small Markdown table if comparing allocations. Do not repeat a full analysis."
+        )
+        delta = _portfolio_completion(system_instruction, prompt, model, PORTFOLIO_DELTA_MAX_TOKENS)
+        analysis = f"{delta}\n\n---\n\n{base['analysis']}"
+        portfolio_cache.store(key, scope, weights, analysis, full=False)
+        return {"analysis": analysis, "cache": "delta"}
 
     prompt = (
         f"Analyze this investment portfolio (Total Value: ${total_value:.2f}) based on the '{request.mode}' strategy:\n"
@@ -171,37 +342,11 @@ def analyze_portfolio(request: PortfolioAnalysisRequest):
         "- Format the response in clear Markdown."
     )
 
-    system_instruction = "You are an expert financial advisor using Warren Buffett and Ray Dalio principles. You strictly outputs Markdown tables for data comparisons."
-    if request.language == 'th':
-        system_instruction += " IMPORTANT: You MUST output the entire response in Thai Language (ภาษาไทย). Translating technical terms is optional but the main content must be Thai."
-
-    try:
-        completion = client.chat.completions.create(
-            model=request.model or "qwen/qwen3-32b",
-            messages=[
-                {
-                    "role": "system",
-                    "content": system_instruction
-                },
-                {
-                    "role": "user",
-                    "content": prompt
-                }
-            ],
-            temperature=0.7,
-            max_tokens=4096,
-            top_p=1,
-            stream=False,
-            stop=None,
-        )
-        
-        content = completion.choices[0].message.content
-        clean_content = re.sub(r'<think>.*?</think>', '', content, flags=re.DOTALL).strip()
-        return {"analysis": clean_content}
-        
-    except Exception as e:
-        print(f"AI Analysis Error: {e}")
-        raise HTTPException(status_code=500, detail=f"Groq API Error: {str(e)}")
+    analysis = _portfolio_completion(system_instruction, prompt, model, 4096)
+    if not cacheable:
+        return {"analysis": analysis, "cache": "off"}
+    portfolio_cache.store(key, scope, weights, analysis, full=True)
+    return {"analysis": analysis, "cache": "miss"}
 
 
 def chat(request: ChatRequest):
@@ -229,7 +374,7 @@ def chat(request: ChatRequest):
     messages.append({"role": "user", "content": request.message})
     
     try:
-        completion = client.chat.completions.create(
+        completion = get_client().chat.completions.create(
             model=request.model or "qwen/qwen3-32b",
             messages=messages,
             temperature=0.7,
@@ -0,0 +1,316 @@
+"""
+Alerts Service Module
+
+Server-side price alerts:
+- Clients register thresholds on symbols (price above/below, % move since
+  creation, % change vs previous close)
+- Alerts are kept in struct-of-arrays numpy buffers with a symbol column,
+  so every fresh quote batch is evaluated in one vectorized pass
+- Triggered alerts are one-shot and pushed to the owning client over
+  Server-Sent Events; every event gets an increasing eventId (the SSE id)
+  so reconnects replay exactly what was missed from a small buffer
+- A background poller keeps alerted symbols refreshed through the shared
+  price cache in finance.get_current_prices
+"""
+
+import asyncio
+import itertools
+import json
+import os
+import threading
+import time
+from collections import deque
+
+from fastapi import HTTPException
+
+from . import finance, symbols
+
+ABOVE, BELOW, MOVE, DAY_CHANGE = 0, 1, 2, 3
+KINDS = {"above": ABOVE, "below": BELOW, "move": MOVE, "dayChange": DAY_CHANGE}
+KIND_NAMES = {v: k for k, v in KINDS.items()}
+
+MAX_ALERTS = 100000
+MAX_ALERTS_PER_CLIENT = 200
+EVENT_BUFFER_SIZE = 50  # recent triggered alerts kept per client
+STREAM_KEEPALIVE = 15  # seconds
+ALERT_REFRESH_INTERVAL = int(os.getenv("ALERT_REFRESH_INTERVAL", "15"))  # seconds
+
+_lock = threading.RLock()
+_ids = itertools.count(1)
+_event_ids = itertools.count(1)
+
+# Struct-of-arrays storage; rows [0, _size) are in use, inactive rows are
+# compacted away once they make up half of the buffer.
+_capacity = 0
+_size = 0
+_inactive = 0
+_cols = {}  # "id", "sym", "kind", "threshold", "base", "active" -> numpy arrays
+_clients = []  # client id per row
+_created = []  # creation timestamp per row
+_row_by_id = {}
+_client_alerts = {}  # client -> set of active alert ids
+
+_symbol_codes = {}
+_code_symbols = []
+_symbol_counts = {}  # symbol -> active alerts
+
+_events = {}  # client -> deque of triggered events
+_subscribers = {}  # client -> list of (loop, asyncio.Queue)
+_poller = None
+
+def _np():
+    import numpy as np
+    return np
+
+def _grow(min_capacity: int):
+    global _capacity
+    np = _np()
+    new_capacity = max(1024, _capacity * 2, min_capacity)
+    dtypes = {"id": np.int64, "sym": np.int32, "kind": np.int8,
+              "threshold": np.float64, "base": np.float64, "active": np.bool_}
+    for name, dtype in dtypes.items():
+        arr = np.zeros(new_capacity, dtype=dtype)
+        if name in _cols:
+            arr[:_size] = _cols[name][:_size]
+        _cols[name] = arr
+    _capacity = new_capacity
+
+def _compact():
+    """Drop inactive rows, keeping the remaining rows in order."""
+    global _size, _inactive, _clients, _created
+    keep = _cols["active"][:_size].nonzero()[0]
+    for name, arr in _cols.items():
+        arr[:len(keep)] = arr[keep]
+    _clients = [_clients[i] for i in keep]
+    _created = [_created[i] for i in keep]
+    _size = len(keep)
+    _inactive = 0
+    _row_by_id.clear()
+    for row, alert_id in enumerate(_cols["id"][:_size].tolist()):
+        _row_by_id[alert_id] = row
+
+def _symbol_code(symbol: str) -> int:
+    code = _symbol_codes.get(symbol)
+    if code is None:
+        code = _symbol_codes[symbol] = len(_code_symbols)
+        _code_symbols.append(symbol)
+    return code
+
+def _row_to_dict(row: int) -> dict:
+    base = float(_cols["base"][row])
+    return {
+        "id": int(_cols["id"][row]),
+        "symbol": _code_symbols[_cols["sym"][row]],
+        "kind": KIND_NAMES[int(_cols["kind"][row])],
+        "threshold": float(_cols["threshold"][row]),
+        "basePrice": None if base != base else base,  # NaN until first quote
+        "createdAt": _created[row],
+    }
+
+def _deactivate(row: int):
+    global _inactive
+    _cols["active"][row] = False
+    _inactive += 1
+    alert_id = int(_cols["id"][row])
+    _row_by_id.pop(alert_id, None)
+    ids = _client_alerts.get(_clients[row])
+    if ids is not None:
+        ids.discard(alert_id)
+        if not ids:
+            del _client_alerts[_clients[row]]
+    symbol = _code_symbols[_cols["sym"][row]]
+    _symbol_counts[symbol] -= 1
+    if _symbol_counts[symbol] <= 0:
+        del _symbol_counts[symbol]
+
+def add_alert(client_id: str, symbol: str, kind: str, threshold: float, base_price: float = None) -> dict:
+    global _size
+    if kind not in KINDS:
+        raise HTTPException(status_code=400, detail=f"Unknown alert kind '{kind}'")
+    symbol = symbol.strip().upper()
+    if not symbol:
+        raise HTTPException(status_code=400, detail="Symbol is required")
+    # Alert on the symbol Yahoo actually quotes (BTC -> BTC-USD, BRK.B -> BRK-B)
+    symbol = symbols.to_yf_symbol(symbol, symbols.lookup_symbol(symbol))
+    if KINDS[kind] in (MOVE, DAY_CHANGE):
+        threshold = abs(threshold)
+
+    if base_price is None and KINDS[kind] == MOVE:
+        cached = finance.PRICE_CACHE.get(symbol)
+        if cached:
+            base_price = cached["data"]["price"]
+
+    with _lock:
+        if len(_row_by_id) >= MAX_ALERTS:
+            raise HTTPException(status_code=503, detail="Alert capacity reached")
+        if len(_client_alerts.get(client_id, ())) >= MAX_ALERTS_PER_CLIENT:
+            raise HTTPException(status_code=400, detail=f"Too many alerts (max {MAX_ALERTS_PER_CLIENT})")
+        if _size >= _capacity:
+            _grow(_size + 1)
+
+        row = _size
+        alert_id = next(_ids)
+        _cols["id"][row] = alert_id
+        _cols["sym"][row] = _symbol_code(symbol)
+        _cols["kind"][row] = KINDS[kind]
+        _cols["threshold"][row] = threshold
+        _cols["base"][row] = base_price if base_price else float("nan")
+        _cols["active"][row] = True
+        _clients.append(client_id)
+        _created.append(time.time())
+        _row_by_id[alert_id] = row
+        _client_alerts.setdefault(client_id, set()).add(alert_id)
+        _symbol_counts[symbol] = _symbol_counts.get(symbol, 0) + 1
+        _size += 1
+        alert = _row_to_dict(row)
+
+    _ensure_started()
+    return alert
+
+def list_alerts(client_id: str) -> list:
+    with _lock:
+        rows = sorted(_row_by_id[aid] for aid in _client_alerts.get(client_id, ()))
+        return [_row_to_dict(row) for row in rows]
+
+def remove_alert(client_id: str, alert_id: int):
+    with _lock:
+        row = _row_by_id.get(alert_id)
+        if row is None or _clients[row] != client_id:
+            raise HTTPException(status_code=404, detail="Alert not found")
+        _deactivate(row)
+    return {"status": "deleted", "id": alert_id}
+
+def watched_symbols() -> list:
+    with _lock:
+        return list(_symbol_counts)
+
+def evaluate(quotes: dict) -> list:
+    """
+    Evaluate all active alerts against `quotes` ({symbol: {"price", "changePercent"}})
+    in one vectorized pass. Triggered alerts are deactivated and delivered.
+    """
+    with _lock:
+        if not _symbol_counts:
+            return []
+        np = _np()
+        prices = np.full(len(_code_symbols), np.nan)
+        changes = np.full(len(_code_symbols), np.nan)
+        for symbol, quote in quotes.items():
+            code = _symbol_codes.get(symbol)
+            if code is None or not quote or quote.get("status") == "unavailable" or not quote.get("price"):
+                continue
+            prices[code] = quote["price"]
+            changes[code] = quote.get("changePercent") or 0
+
+        n = _size
+        active = _cols["active"][:n]
+        kind = _cols["kind"][:n]
+        threshold = _cols["threshold"][:n]
+        base = _cols["base"][:n]
+        p = prices[_cols["sym"][:n]]
+        c = changes[_cols["sym"][:n]]
+
+        # "move" alerts created without a known price start from the first quote seen
+        needs_base = active & (kind == MOVE) & np.isnan(base) & ~np.isnan(p)
+        base[needs_base] = p[needs_base]
+
+        with np.errstate(invalid="ignore", divide="ignore"):
+            move = np.abs(p / base - 1.0) * 100.0
+            hit = (
+                ((kind == ABOVE) & (p >= threshold))
+                | ((kind == BELOW) & (p <= threshold))
+                | ((kind == MOVE) & ~needs_base & (move >= threshold))
+                | ((kind == DAY_CHANGE) & (np.abs(c) >= threshold))
+            ) & active
+
+        triggered = []
+        now = time.time()
+        for row in np.flatnonzero(hit).tolist():
+            event = _row_to_dict(row)
+            event["price"] = float(p[row])
+            event["changePercent"] = float(c[row])
+            event["triggeredAt"] = now
+            event["eventId"] = next(_event_ids)
+            triggered.append((_clients[row], event))
+            _deactivate(row)
+
+        if _inactive and _inactive * 2 >= _size:
+            _compact()
+
+    for client_id, event in triggered:
+        _deliver(client_id, event)
+    return [event for _, event in triggered]
+
+# --- Delivery ---
+
+def _deliver(client_id: str, event: dict):
+    with _lock:
+        _events.setdefault(client_id, deque(maxlen=EVENT_BUFFER_SIZE)).append(event)
+        subscribers = list(_subscribers.get(client_id, []))
+    for loop, queue in subscribers:
+        loop.call_soon_threadsafe(_put_nowait, queue, event)
+
+def _put_nowait(queue, event):
+    try:
+        queue.put_nowait(event)
+    except asyncio.QueueFull:
+        pass  # slow consumer; the event is still in the replay buffer
+
+def recent_events(client_id: str, since: int = 0) -> list:
+    """Buffered events with an eventId greater than `since`."""
+    with _lock:
+        return [e for e in _events.get(client_id, []) if e["eventId"] > since]
+
+def _sse(event: dict) -> str:
+    return f"id: {event['eventId']}\nevent: alert\ndata: {json.dumps(event)}\n\n"
+
+async def event_stream(client_id: str, since: float = None):
+    """
+    Server-Sent Events stream of triggered alerts for `client_id`. With
+    `since` (the last seen eventId), buffered events after it are replayed.
+    """
+    loop = asyncio.get_running_loop()
+    queue = asyncio.Queue(maxsize=100)
+    with _lock:
+        _subscribers.setdefault(client_id, []).append((loop, queue))
+    try:
+        yield ": connected\n\n"
+        if since is not None:
+            for event in recent_events(client_id, since):
+                yield _sse(event)
+        while True:
+            try:
+                event = await asyncio.wait_for(queue.get(), timeout=STREAM_KEEPALIVE)
+                yield _sse(event)
+            except asyncio.TimeoutError:
+                yield ": keep-alive\n\n"
+    finally:
+        with _lock:
+            subs = _subscribers.get(client_id, [])
+            if (loop, queue) in subs:
+                subs.remove((loop, queue))
+            if not subs:
+                _subscribers.pop(client_id, None)
+
+# --- Shared quote refresh ---
+
+def _poll_loop():
+    while True:
+        time.sleep(ALERT_REFRESH_INTERVAL)
+        symbols = watched_symbols()
+        for start in range(0, len(symbols), finance.MAX_PRICE_SYMBOLS):
+            chunk = symbols[start:start + finance.MAX_PRICE_SYMBOLS]
+            try:
+                # Fresh fetches reach evaluate() through finance.QUOTE_LISTENERS
+                finance.get_current_prices(",".join(chunk))
+            except Exception as e:
+                print(f"Alert refresh error: {e}")
+
+def _ensure_started():
+    """On first alert: hook evaluation into the shared price refresh and start the poller."""
+    global _poller
+    with _lock:
+        if _poller is None:
+            finance.QUOTE_LISTENERS.append(evaluate)
+            _poller = threading.Thread(target=_poll_loop, name="alert-poller", daemon=True)
+            _poller.start()
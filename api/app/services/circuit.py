@@ -0,0 +1,151 @@
+"""
+Circuit Breaker Module
+
+Per-symbol and per-upstream circuit breakers with exponential negative caching:
+- A failing symbol (delisted, bad ticker) is skipped for a growing TTL
+- An upstream (Yahoo, ForexFactory) that fails for many consecutive calls
+  is skipped entirely until its own TTL expires
+- After the TTL expires calls are let through again (half-open): the first
+  failure reopens the breaker with a doubled TTL, a success closes it
+- Symbol state is keyed by user input, so it is capped at
+  SYMBOL_MAX_ENTRIES (expired entries are pruned first)
+"""
+
+import threading
+import time
+
+# Per-symbol negative cache: 30s, 60s, 120s, ... capped at 1 hour
+SYMBOL_BASE_TTL = 30  # seconds
+SYMBOL_MAX_TTL = 60 * 60  # seconds
+SYMBOL_MAX_ENTRIES = 10000
+
+# Per-upstream breaker opens after this many consecutive failures
+UPSTREAM_FAILURE_THRESHOLD = 5
+UPSTREAM_BASE_TTL = 10  # seconds
+UPSTREAM_MAX_TTL = 5 * 60  # seconds
+
+YAHOO = "yahoo"
+FOREXFACTORY = "forexfactory"
+
+UNAVAILABLE = "unavailable"
+
+# key -> {"failures": int, "openUntil": float}
+_symbol_state = {}
+# upstream -> {"consecutiveFailures": int, "trips": int, "openUntil": float}
+_upstream_state = {}
+_lock = threading.Lock()
+
+def _backoff(base: float, maximum: float, attempt: int) -> float:
+    return min(base * (2 ** max(attempt - 1, 0)), maximum)
+
+def _prune_symbols(now: float):
+    """Make room in _symbol_state (caller holds _lock)."""
+    for key in [k for k, st in _symbol_state.items() if st["openUntil"] <= now]:
+        del _symbol_state[key]
+    # Still full: drop the oldest tenth (dicts keep insertion order)
+    if len(_symbol_state) >= SYMBOL_MAX_ENTRIES:
+        for key in list(_symbol_state)[:SYMBOL_MAX_ENTRIES // 10]:
+            del _symbol_state[key]
+
+def _symbol_key(upstream: str, symbol: str) -> str:
+    return f"{upstream}:{symbol.upper()}"
+
+def retry_after(upstream: str, symbol: str = None) -> float:
+    """
+    Seconds until `upstream` (or `symbol` on it) may be called again.
+    Returns 0 when the call is allowed.
+    """
+    now = time.time()
+    with _lock:
+        remaining = 0
+        up = _upstream_state.get(upstream)
+        if up and up["openUntil"] > now:
+            remaining = up["openUntil"] - now
+        if symbol:
+            st = _symbol_state.get(_symbol_key(upstream, symbol))
+            if st and st["openUntil"] > now:
+                remaining = max(remaining, st["openUntil"] - now)
+        return round(remaining, 1)
+
+def is_open(upstream: str, symbol: str = None) -> bool:
+    return retry_after(upstream, symbol) > 0
+
+def record_success(upstream: str, symbol: str = None):
+    with _lock:
+        _upstream_state.pop(upstream, None)
+        if symbol:
+            _symbol_state.pop(_symbol_key(upstream, symbol), None)
+
+# Exception class names (requests / curl_cffi / yfinance) that mean Yahoo itself is unreachable or throttling
+TRANSPORT_ERRORS = {
+    "ConnectionError", "ConnectTimeout", "ReadTimeout", "Timeout", "SSLError", "ProxyError",
+    "ChunkedEncodingError", "YFRateLimitError",
+}
+
+def is_upstream_error(exc: Exception) -> bool:
+    """
+    True for transport-level failures (connection errors, timeouts, HTTP 429/5xx)
+    that should count against the upstream breaker. Anything else is treated as
+    a data problem with the individual symbol.
+    """
+    if isinstance(exc, (TimeoutError, ConnectionError)):
+        return True
+    status = getattr(getattr(exc, "response", None), "status_code", None)
+    if isinstance(status, int):
+        return status == 429 or status >= 500
+    return any(cls.__name__ in TRANSPORT_ERRORS for cls in type(exc).__mro__)
+
+def record_failure(upstream: str, symbol: str = None, upstream_error: bool = True) -> float:
+    """
+    Record a failed call and return the negative-cache TTL now in effect.
+    `upstream_error=False` means the upstream answered but had no (usable)
+    data for the symbol; only the symbol breaker is affected. Use
+    is_upstream_error() to classify exceptions.
+    """
+    now = time.time()
+    with _lock:
+        ttl = 0
+        if symbol:
+            key = _symbol_key(upstream, symbol)
+            if key not in _symbol_state and len(_symbol_state) >= SYMBOL_MAX_ENTRIES:
+                _prune_symbols(now)
+            st = _symbol_state.setdefault(key, {"failures": 0, "openUntil": 0})
+            st["failures"] += 1
+            ttl = _backoff(SYMBOL_BASE_TTL, SYMBOL_MAX_TTL, st["failures"])
+            st["openUntil"] = now + ttl
+
+        if not upstream_error:
+            return ttl
+
+        up = _upstream_state.setdefault(upstream, {"consecutiveFailures": 0, "trips": 0, "openUntil": 0})
+        up["consecutiveFailures"] += 1
+        # Half-open after an earlier trip: a single failed trial reopens the breaker
+        half_open = up["trips"] > 0 and up["openUntil"] <= now
+        if half_open or up["consecutiveFailures"] >= UPSTREAM_FAILURE_THRESHOLD:
+            up["trips"] += 1
+            up_ttl = _backoff(UPSTREAM_BASE_TTL, UPSTREAM_MAX_TTL, up["trips"])
+            up["openUntil"] = now + up_ttl
+            up["consecutiveFailures"] = 0
+            print(f"Circuit open for {upstream} ({up_ttl}s)")
+            ttl = max(ttl, up_ttl)
+        return ttl
+
+def unavailable(upstream: str, symbol: str = None) -> dict:
+    """Marker merged into responses for items skipped by an open breaker."""
+    return {"status": UNAVAILABLE, "retryAfter": retry_after(upstream, symbol)}
+
+def get_state() -> dict:
+    """Snapshot of currently open breakers, for diagnostics."""
+    now = time.time()
+    with _lock:
+        return {
+            "upstreams": {
+                name: {"open": st["openUntil"] > now, "retryAfter": round(max(st["openUntil"] - now, 0), 1),
+                       "consecutiveFailures": st["consecutiveFailures"]}
+                for name, st in _upstream_state.items()
+            },
+            "symbols": {
+                key: {"failures": st["failures"], "retryAfter": round(st["openUntil"] - now, 1)}
+                for key, st in _symbol_state.items() if st["openUntil"] > now
+            },
+        }
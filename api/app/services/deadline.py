@@ -0,0 +1,103 @@
+"""
+Deadline Module
+
+Per-request deadlines for upstream calls (Yahoo, ForexFactory, Groq):
+- A deadline is an absolute time.monotonic() value created per request
+- Calls run on shared, bounded worker pools: UPSTREAM for Yahoo /
+  ForexFactory, LLM for Groq, so slow LLM calls cannot starve quotes
+- Each request submits at most the pool's fan-out limit at a time, so one
+  large batch cannot occupy a whole pool
+- Results are waited on only until the deadline; whatever finished is
+  returned and the rest is reported as timed out. Calls already running at
+  the deadline finish in the background (and still fill the caches);
+  calls not yet started are dropped
+"""
+
+import os
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from concurrent.futures import TimeoutError as FutureTimeoutError
+
+REQUEST_DEADLINE_SECONDS = float(os.getenv("REQUEST_DEADLINE_SECONDS", "8"))
+MIN_DEADLINE_SECONDS = 0.5
+MAX_DEADLINE_SECONDS = 30
+UPSTREAM_WORKERS = int(os.getenv("UPSTREAM_WORKERS", "32"))
+LLM_WORKERS = int(os.getenv("LLM_WORKERS", "16"))
+
+UPSTREAM = "upstream"
+LLM = "llm"
+
+# pool -> (workers, max calls in flight per request)
+POOLS = {
+    UPSTREAM: (UPSTREAM_WORKERS, max(1, UPSTREAM_WORKERS // 2)),
+    LLM: (LLM_WORKERS, max(1, LLM_WORKERS // 2)),
+}
+
+_executors = {}
+_executor_lock = threading.Lock()
+
+def _get_executor(pool: str = UPSTREAM) -> ThreadPoolExecutor:
+    executor = _executors.get(pool)
+    if executor is None:
+        with _executor_lock:
+            executor = _executors.get(pool)
+            if executor is None:
+                executor = _executors[pool] = ThreadPoolExecutor(max_workers=POOLS[pool][0], thread_name_prefix=pool)
+    return executor
+
+def start(timeout: float = None) -> float:
+    """Create a deadline `timeout` seconds from now (clamped; default REQUEST_DEADLINE_SECONDS)."""
+    if timeout is None:
+        timeout = REQUEST_DEADLINE_SECONDS
+    timeout = min(max(timeout, MIN_DEADLINE_SECONDS), MAX_DEADLINE_SECONDS)
+    return time.monotonic() + timeout
+
+def remaining(deadline: float) -> float:
+    return max(0.0, deadline - time.monotonic())
+
+def expired(deadline: float) -> bool:
+    return remaining(deadline) <= 0
+
+def gather(calls: dict, deadline: float, pool: str = UPSTREAM):
+    """
+    Run `calls` ({key: zero-arg callable}) on `pool` until `deadline`, with at
+    most the pool's per-request fan-out in flight at once.
+    Returns (results, errors, timed_out): results/errors are dicts by key,
+    timed_out is the list of keys that did not finish in time.
+    """
+    if not calls:
+        return {}, {}, []
+    executor = _get_executor(pool)
+    pending = list(calls.items())
+    pending.reverse()
+    in_flight = {}
+    results, errors = {}, {}
+
+    while pending or in_flight:
+        while pending and len(in_flight) < POOLS[pool][1]:
+            key, fn = pending.pop()
+            in_flight[executor.submit(fn)] = key
+        done, _ = wait(in_flight, timeout=remaining(deadline), return_when=FIRST_COMPLETED)
+        if not done:
+            break  # deadline reached; nothing new starts after it
+        for future in done:
+            key = in_flight.pop(future)
+            try:
+                results[key] = future.result()
+            except Exception as e:
+                errors[key] = e
+
+    for future in in_flight:
+        future.cancel()  # only helps if it has not started yet
+    timed_out = [key for key in calls if key not in results and key not in errors]
+    return results, errors, timed_out
+
+def call(fn, deadline: float, pool: str = UPSTREAM):
+    """Run a single call on `pool`; raises TimeoutError if it misses `deadline`."""
+    future = _get_executor(pool).submit(fn)
+    try:
+        return future.result(timeout=remaining(deadline))
+    except FutureTimeoutError:
+        future.cancel()
+        raise TimeoutError("Upstream call missed the request deadline")
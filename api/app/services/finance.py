@@ -1,8 +1,13 @@
-import yfinance as yf
 import re
 import time
+from functools import partial
 from fastapi import HTTPException
 
+from . import circuit, deadline, market_calendar, news_cluster, symbols
+
+# Heavy dependencies (yfinance/pandas, requests, bs4) are imported inside the
+# functions that use them so that importing the app stays fast on cold start.
+
 # Regex to find stock tickers in title (e.g., NVDA, AAPL, MSFT in parentheses or standalone)
 TICKER_PATTERN = re.compile(r'\b([A-Z]{2,5})\b|\(([A-Z]{2,5})\)')
 
@@ -16,12 +21,39 @@ TICKER_EXCLUDES = {
 }
 
 # In-memory cache for news to speed up repeated requests
+# TTLs apply while the relevant market trades; see market_calendar.cache_ttl
 NEWS_CACHE = {}
 NEWS_CACHE_TTL = 60  # seconds
+NEWS_CLOSED_MAX_TTL = 15 * 60  # seconds, news still flows while markets are closed
+NEWS_SOURCE_CACHE = {}  # per-ticker articles, fallback when a ticker misses the deadline
+PARTIAL_CACHE_TTL = 5  # seconds, for responses missing some sources
 
 # In-memory cache for prices to reduce Yahoo calls
 PRICE_CACHE = {}
 PRICE_CACHE_TTL = 15  # seconds
+MAX_PRICE_SYMBOLS = 100  # per /api/prices request
+
+# Callbacks receiving {symbol: quote} for every fresh (non-cached) price batch
+QUOTE_LISTENERS = []
+
+# Batch symbol resolution (portfolio import)
+RESOLVE_CACHE = {}
+RESOLVE_CACHE_TTL = 24 * 60 * 60  # seconds
+RESOLVE_MISS_TTL = 60 * 60  # seconds, for queries Yahoo has no match for
+RESOLVE_MAX_QUERIES = 500
+RESOLVE_CACHE_MAX_ENTRIES = 10000
+RESOLVE_TIMEOUT = 20  # seconds; import jobs get a longer deadline than page loads
+
+# yfinance quoteType -> type names used by the symbol index / frontend
+QUOTE_TYPES = {
+    "EQUITY": "Stock",
+    "ETF": "ETF",
+    "MUTUALFUND": "Fund",
+    "INDEX": "Index",
+    "CRYPTOCURRENCY": "Crypto",
+    "CURRENCY": "Currency",
+    "FUTURE": "Future",
+}
 
 def extract_tickers_from_title(title: str) -> list:
     """Extract potential stock tickers from news title."""
@@ -35,12 +67,14 @@ def extract_tickers_from_title(title: str) -> list:
             tickers.append(ticker)
     return list(set(tickers))[:5]  # Dedupe and limit to 5
 
-def search_assets(q: str):
+def search_assets(q: str, timeout: float = None):
     if not q:
         return []
     
+    import yfinance as yf
+
     try:
-        tickers = yf.Search(q, max_results=10).quotes
+        tickers = deadline.call(lambda: yf.Search(q, max_results=10).quotes, deadline.start(timeout))
         results = []
         for t in tickers:
             results.append({
@@ -55,29 +89,252 @@ def search_assets(q: str):
         print(f"Search error: {e}")
         return []
 
-def get_asset_info(symbol: str):
+def _resolve_local(query: str):
+    """Resolve against the local symbol index by ticker, then by company name."""
+    entry = symbols.lookup_symbol(query)
+    symbol = query.upper()
+    if entry is None:
+        match = symbols.lookup_name(query)
+        if match is None:
+            return None
+        symbol, entry = match
+    yf_symbol = symbols.to_yf_symbol(symbol, entry)
+    return {
+        "symbol": yf_symbol,
+        "name": entry.get('name'),
+        "type": entry.get('type', 'Unknown'),
+        "currency": symbols.currency_for_symbol(yf_symbol),
+        "source": "index",
+        "status": "resolved"
+    }
+
+def _cache_resolution(query: str, ttl: float, result: dict):
+    """Store a Yahoo lookup; queries are user input, so the cache is bounded."""
+    key = query.upper()
+    if key not in RESOLVE_CACHE and len(RESOLVE_CACHE) >= RESOLVE_CACHE_MAX_ENTRIES:
+        now = time.time()
+        for k in [k for k, v in list(RESOLVE_CACHE.items()) if now - v["ts"] >= v["ttl"]]:
+            RESOLVE_CACHE.pop(k, None)
+        # Still full: drop the oldest tenth (dicts keep insertion order)
+        if len(RESOLVE_CACHE) >= RESOLVE_CACHE_MAX_ENTRIES:
+            for k in list(RESOLVE_CACHE)[:RESOLVE_CACHE_MAX_ENTRIES // 10]:
+                RESOLVE_CACHE.pop(k, None)
+    RESOLVE_CACHE[key] = {"ts": time.time(), "ttl": ttl, "data": result}
+
+def _resolve_yahoo(query: str):
+    import yfinance as yf
+
+    if circuit.is_open(circuit.YAHOO, query):
+        return {"symbol": None, "name": None, "type": None, "currency": None, "source": None,
+                **circuit.unavailable(circuit.YAHOO, query)}
     try:
-        ticker = yf.Ticker(symbol)
-        info = ticker.info
-        price = info.get('currentPrice') or info.get('regularMarketPrice') or info.get('previousClose')
-        return {
-            "symbol": symbol,
-            "name": info.get('shortName') or info.get('longName'),
-            "price": price,
-            "currency": info.get('currency', 'USD'),
-            "sector": info.get('sector', 'Unknown'),
-            "industry": info.get('industry', 'Unknown'),
-            "type": info.get('quoteType', 'Unknown')
-        }
+        quotes = yf.Search(query, max_results=1).quotes
+    except Exception as e:
+        print(f"Resolve error for {query}: {e}")
+        circuit.record_failure(circuit.YAHOO, query, upstream_error=circuit.is_upstream_error(e))
+        return {"symbol": None, "name": None, "type": None, "currency": None, "source": None,
+                **circuit.unavailable(circuit.YAHOO, query)}
+
+    circuit.record_success(circuit.YAHOO, query)
+    if not quotes:
+        result = {"symbol": None, "name": None, "type": None, "currency": None, "source": "yahoo", "status": "unresolved"}
+        _cache_resolution(query, RESOLVE_MISS_TTL, result)
+        return result
+    t = quotes[0]
+    quote_type = t.get('quoteType', 'Unknown')
+    result = {
+        "symbol": t['symbol'],
+        "name": t.get('shortname', t.get('longname', t['symbol'])),
+        "type": QUOTE_TYPES.get(quote_type, quote_type),
+        "currency": symbols.currency_for_symbol(t['symbol']),
+        "source": "yahoo",
+        "status": "resolved"
+    }
+    # Cached here so lookups that miss the request deadline still help the next call
+    _cache_resolution(query, RESOLVE_CACHE_TTL, result)
+    return result
+
+def resolve_symbols(queries: list, timeout: float = None):
+    """
+    Resolve many raw symbols / company names (e.g. from a broker CSV) to
+    canonical yfinance symbols in one call: local index first, then Yahoo
+    search for the rest, concurrently. Lookups still running at the
+    deadline are returned with status "missing".
+    """
+    if len(queries) > RESOLVE_MAX_QUERIES:
+        raise HTTPException(status_code=400, detail=f"Too many symbols (max {RESOLVE_MAX_QUERIES})")
+
+    unique = []
+    seen = set()
+    for q in queries:
+        q = (q or "").strip()
+        if q and q.upper() not in seen:
+            seen.add(q.upper())
+            unique.append(q)
+
+    now = time.time()
+    resolved = {}
+    remote = []
+    for q in unique:
+        key = q.upper()
+        cached = RESOLVE_CACHE.get(key)
+        if cached and (now - cached["ts"] < cached["ttl"]):
+            resolved[key] = cached["data"]
+            continue
+        local = _resolve_local(q)
+        if local:
+            resolved[key] = local
+        else:
+            remote.append(q)
+
+    if remote:
+        dl = deadline.start(timeout if timeout is not None else RESOLVE_TIMEOUT)
+        results, errors, timed_out = deadline.gather({q: partial(_resolve_yahoo, q) for q in remote}, dl)
+        for q in remote:
+            resolved[q.upper()] = results.get(q) or {
+                "symbol": None, "name": None, "type": None, "currency": None, "source": None, "status": "missing"
+            }
+
+    results = []
+    for q in queries:
+        q = (q or "").strip()
+        if not q:
+            continue
+        results.append({"query": q, **resolved[q.upper()]})
+
+    return {
+        "results": results,
+        "resolved": sum(1 for r in results if r["status"] == "resolved"),
+        "unresolved": sum(1 for r in results if r["status"] != "resolved"),
+    }
+
+def get_asset_info(symbol: str, timeout: float = None):
+    import yfinance as yf
+
+    wait = circuit.retry_after(circuit.YAHOO, symbol)
+    if wait:
+        if circuit.is_open(circuit.YAHOO):
+            raise HTTPException(status_code=503, detail="Upstream unavailable", headers={"Retry-After": str(int(wait) + 1)})
+        raise HTTPException(status_code=404, detail="Asset not found", headers={"Retry-After": str(int(wait) + 1)})
+
+    try:
+        info = deadline.call(lambda: yf.Ticker(symbol).info, deadline.start(timeout))
+    except TimeoutError:
+        raise HTTPException(status_code=504, detail="Upstream timed out")
     except Exception as e:
         print(f"Info error for {symbol}: {e}")
+        circuit.record_failure(circuit.YAHOO, symbol, upstream_error=circuit.is_upstream_error(e))
+        raise HTTPException(status_code=404, detail="Asset not found")
+
+    price = info.get('currentPrice') or info.get('regularMarketPrice') or info.get('previousClose')
+    name = info.get('shortName') or info.get('longName')
+    if not price and not name:
+        circuit.record_failure(circuit.YAHOO, symbol, upstream_error=False)
         raise HTTPException(status_code=404, detail="Asset not found")
 
-def get_current_prices(symbols_str: str):
+    circuit.record_success(circuit.YAHOO, symbol)
+    return {
+        "symbol": symbol,
+        "name": name,
+        "price": price,
+        "currency": info.get('currency', 'USD'),
+        "sector": info.get('sector', 'Unknown'),
+        "industry": info.get('industry', 'Unknown'),
+        "type": info.get('quoteType', 'Unknown')
+    }
+
+def _unavailable_price(symbol: str) -> dict:
+    cached = PRICE_CACHE.get(symbol)
+    if cached and circuit.is_open(circuit.YAHOO):
+        # Yahoo-wide breaker: the last known quote is more useful than a zero price
+        return {**cached["data"], "status": "stale", "retryAfter": circuit.retry_after(circuit.YAHOO)}
+    return {"price": 0, "change": 0, "changePercent": 0, "previousClose": 0, **circuit.unavailable(circuit.YAHOO, symbol)}
+
+def _notify_quote_listeners(quotes: dict):
+    for listener in QUOTE_LISTENERS:
+        try:
+            listener(quotes)
+        except Exception as e:
+            print(f"Quote listener error: {e}")
+
+def _missing_price(symbol: str) -> dict:
+    return {"price": 0, "change": 0, "changePercent": 0, "previousClose": 0, "status": "missing"}
+
+def _fetch_quote(tickers, symbol: str):
+    """
+    Fetch one quote (fast_info -> history -> info fallback chain), update the
+    price cache and circuit breaker, and return the result. Runs on the
+    upstream pool; once started, a result that misses the deadline still
+    lands in PRICE_CACHE.
+    """
+    if circuit.is_open(circuit.YAHOO):
+        return _unavailable_price(symbol)
+    try:
+        ticker = tickers.tickers[symbol]
+        price = None
+        prev_close = None
+        change = None
+        change_percent = None
+
+        if hasattr(ticker, 'fast_info'):
+            price = ticker.fast_info.last_price
+            prev_close = ticker.fast_info.previous_close
+
+        # Fallback to history if fast_info is missing or incomplete
+        if not price or not prev_close:
+            hist = ticker.history(period="2d")
+            if not hist.empty:
+                price = price or hist['Close'].iloc[-1]
+                prev_close = prev_close or (hist['Close'].iloc[0] if len(hist) > 1 else price)
+
+        if price is None:
+            # Absolute fallback
+            price = ticker.info.get('currentPrice', 0)
+            prev_close = prev_close or price
+
+        if not price:
+            # Yahoo answered but has no quote (delisted / unknown symbol)
+            circuit.record_failure(circuit.YAHOO, symbol, upstream_error=False)
+            return _unavailable_price(symbol)
+
+        if prev_close:
+            change = price - prev_close
+            change_percent = (change / prev_close * 100) if prev_close else 0
+        else:
+            change = 0
+            change_percent = 0
+
+        result = {
+            "price": price,
+            "change": change,
+            "changePercent": change_percent,
+            "previousClose": prev_close,
+            "status": "ok"
+        }
+        PRICE_CACHE[symbol] = {
+            "ts": time.time(),
+            "ttl": market_calendar.cache_ttl(symbol, PRICE_CACHE_TTL),
+            "data": result
+        }
+        circuit.record_success(circuit.YAHOO, symbol)
+        return result
+    except Exception as e:
+        print(f"Error fetching {symbol}: {e}")
+        circuit.record_failure(circuit.YAHOO, symbol, upstream_error=circuit.is_upstream_error(e))
+        return _unavailable_price(symbol)
+
+def get_current_prices(symbols_str: str, timeout: float = None):
+    """
+    Quotes for a comma-separated symbol list. Symbols are fetched concurrently
+    until the request deadline; those still pending are returned from the
+    expired cache with status "stale", or with status "missing".
+    """
     if not symbols_str:
         return {}
         
-    symbol_list = [s.strip().upper() for s in symbols_str.split(',')]
+    symbol_list = list(dict.fromkeys(s.strip().upper() for s in symbols_str.split(',') if s.strip()))
+    if len(symbol_list) > MAX_PRICE_SYMBOLS:
+        raise HTTPException(status_code=400, detail=f"Too many symbols (max {MAX_PRICE_SYMBOLS})")
     prices = {}
 
     now = time.time()
@@ -85,8 +342,11 @@ def get_current_prices(symbols_str: str):
 
     for symbol in symbol_list:
         cached = PRICE_CACHE.get(symbol)
-        if cached and (now - cached["ts"] < PRICE_CACHE_TTL):
+        if cached and (now - cached["ts"] < cached["ttl"]):
             prices[symbol] = cached["data"]
+        elif circuit.is_open(circuit.YAHOO, symbol):
+            # Known-bad symbol or Yahoo down: skip the slow fallback chain
+            prices[symbol] = _unavailable_price(symbol)
         else:
             missing_symbols.append(symbol)
     
@@ -94,64 +354,114 @@ def get_current_prices(symbols_str: str):
         if not missing_symbols:
             return prices
 
+        import yfinance as yf
+        dl = deadline.start(timeout)
         tickers = yf.Tickers(' '.join(missing_symbols))
+        results, errors, timed_out = deadline.gather(
+            {symbol: partial(_fetch_quote, tickers, symbol) for symbol in missing_symbols}, dl
+        )
+
+        fresh = {}
         for symbol in missing_symbols:
-            try:
-                ticker = tickers.tickers[symbol]
-                price = None
-                prev_close = None
-                change = None
-                change_percent = None
-
-                if hasattr(ticker, 'fast_info'):
-                    price = ticker.fast_info.last_price
-                    prev_close = ticker.fast_info.previous_close
-
-                # Fallback to history if fast_info is missing or incomplete
-                if not price or not prev_close:
-                    hist = ticker.history(period="2d")
-                    if not hist.empty:
-                        price = price or hist['Close'].iloc[-1]
-                        prev_close = prev_close or (hist['Close'].iloc[0] if len(hist) > 1 else price)
-
-                if price is None:
-                    # Absolute fallback
-                    price = ticker.info.get('currentPrice', 0)
-                    prev_close = prev_close or price
-
-                if prev_close:
-                    change = price - prev_close
-                    change_percent = (change / prev_close * 100) if prev_close else 0
-                else:
-                    change = 0
-                    change_percent = 0
-
-                result = {
-                    "price": price,
-                    "change": change,
-                    "changePercent": change_percent,
-                    "previousClose": prev_close
-                }
-                prices[symbol] = result
-                PRICE_CACHE[symbol] = {"ts": time.time(), "data": result}
-            except Exception as e:
-                print(f"Error fetching {symbol}: {e}")
-                result = { "price": 0, "change": 0, "changePercent": 0, "previousClose": 0 }
-                prices[symbol] = result
-                PRICE_CACHE[symbol] = {"ts": time.time(), "data": result}
+            result = results.get(symbol)
+            if result is None:
+                cached = PRICE_CACHE.get(symbol)
+                result = {**cached["data"], "status": "stale"} if cached else _missing_price(symbol)
+            elif result.get("status") == "ok":
+                fresh[symbol] = result
+            prices[symbol] = result
+        if timed_out:
+            print(f"Price fetch deadline missed for: {', '.join(timed_out)}")
+        if fresh:
+            _notify_quote_listeners(fresh)
         return prices
     except Exception as e:
         print(f"Batch fetch error: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
-def get_market_news(category: str = "general", symbol: str = None, page: int = 0):
+def _fetch_ticker_news(symbol: str) -> list:
+    """Fetch and normalize Yahoo news for one ticker (runs on the upstream pool)."""
+    import yfinance as yf
+
+    articles = []
+    seen = set()
+    try:
+        news_items = yf.Ticker(symbol).news
+    except Exception as e:
+        circuit.record_failure(circuit.YAHOO, symbol, upstream_error=circuit.is_upstream_error(e))
+        raise
+    circuit.record_success(circuit.YAHOO, symbol)
+
+    for item in news_items:
+        if not item: continue
+        
+        uuid = item.get("uuid")
+        content = item.get('content', item)
+        title = content.get('title')
+        
+        key = uuid if uuid else title
+        
+        if key and key not in seen:
+            seen.add(key)
+            if not content: content = item 
+                
+            link = content.get('link')
+            ctu = content.get('clickThroughUrl')
+            can = content.get('canonicalUrl')
+            
+            if not link:
+                if isinstance(ctu, dict): link = ctu.get('url')
+                elif isinstance(ctu, str): link = ctu
+            
+            if not link:
+                if isinstance(can, dict): link = can.get('url')
+                elif isinstance(can, str): link = can
+                
+            pub_time = content.get('providerPublishTime') or content.get('pubDate')
+            
+            thumb = None
+            thumb_data = content.get('thumbnail')
+            if thumb_data and isinstance(thumb_data, dict):
+                resolutions = thumb_data.get('resolutions', [])
+                if resolutions and isinstance(resolutions, list) and len(resolutions) > 0:
+                    thumb = resolutions[-1].get('url') 
+            
+            publisher = content.get('publisher')
+            if isinstance(publisher, dict): 
+                publisher = publisher.get('title')
+
+            articles.append({
+                "id": uuid,
+                "title": title,
+                "publisher": publisher,
+                "link": link,
+                "providerPublishTime": pub_time,
+                "type": item.get("type", "STORY"),
+                "thumbnail": thumb,
+                "relatedTickers": extract_tickers_from_title(title),
+                "summary": content.get('summary')
+            })
+
+    NEWS_SOURCE_CACHE[symbol] = {"ts": time.time(), "data": articles}
+    return articles
+
+def get_market_news(category: str = "general", symbol: str = None, page: int = 0, cluster: bool = True,
+                    timeout: float = None, missing_sources: list = None):
     """
     Fetch aggregated market news with category filtering or specific symbol.
+    With `cluster`, syndicated near-duplicates are collapsed into one
+    representative carrying `sourceCount` and `publishers`.
+    Tickers are fetched concurrently until the request deadline; a ticker
+    that does not complete (missed the deadline, failed, or skipped by an
+    open circuit breaker) contributes its last known articles (marked
+    `stale`) or, if none, is appended to `missing_sources`.
     """
     try:
-        cache_key = f"{category}:{symbol}:{page}"
+        cache_key = f"{category}:{symbol}:{page}:{cluster}"
         cached = NEWS_CACHE.get(cache_key)
-        if cached and (time.time() - cached["ts"] < NEWS_CACHE_TTL):
+        if cached and (time.time() - cached["ts"] < cached["ttl"]):
+            if missing_sources is not None:
+                missing_sources.extend(cached.get("missing", []))
             return cached["data"]
 
         if symbol:
@@ -193,81 +503,57 @@ def get_market_news(category: str = "general", symbol: str = None, page: int = 0
         if not target_tickers:
             return []
 
-        all_news_map = {} 
-        
-        for symbol in target_tickers:
-            try:
-                ticker = yf.Ticker(symbol)
-                news_items = ticker.news
-                
-                for item in news_items:
-                    if not item: continue
-                    
-                    uuid = item.get("uuid")
-                    content = item.get('content', item)
-                    title = content.get('title')
-                    
-                    key = uuid if uuid else title
-                    
-                    if key and key not in all_news_map:
-                        if not content: content = item 
-                            
-                        link = content.get('link')
-                        ctu = content.get('clickThroughUrl')
-                        can = content.get('canonicalUrl')
-                        
-                        if not link:
-                            if isinstance(ctu, dict): link = ctu.get('url')
-                            elif isinstance(ctu, str): link = ctu
-                        
-                        if not link:
-                            if isinstance(can, dict): link = can.get('url')
-                            elif isinstance(can, str): link = can
-                            
-                        pub_time = content.get('providerPublishTime') or content.get('pubDate')
-                        
-                        thumb = None
-                        thumb_data = content.get('thumbnail')
-                        if thumb_data and isinstance(thumb_data, dict):
-                            resolutions = thumb_data.get('resolutions', [])
-                            if resolutions and isinstance(resolutions, list) and len(resolutions) > 0:
-                                thumb = resolutions[-1].get('url') 
-                        
-                        publisher = content.get('publisher')
-                        if isinstance(publisher, dict): 
-                            publisher = publisher.get('title')
-
-                        all_news_map[key] = {
-                            "id": uuid,
-                            "title": title,
-                            "publisher": publisher,
-                            "link": link,
-                            "providerPublishTime": pub_time,
-                            "type": item.get("type", "STORY"),
-                            "thumbnail": thumb,
-                            "relatedTickers": extract_tickers_from_title(title),
-                            "summary": content.get('summary')
-                        }
-            except Exception as e:
-                continue
+        dl = deadline.start(timeout)
+        live = [t for t in target_tickers if not circuit.is_open(circuit.YAHOO, t)]
+        results, errors, timed_out = deadline.gather({t: partial(_fetch_ticker_news, t) for t in live}, dl)
+
+        all_news_map = {}
+        incomplete = []
+        missing = []
+        for t in target_tickers:
+            if t in results:
+                articles = results[t]
+            else:
+                # Timed out, failed or skipped by the breaker: fall back to the last known articles
+                incomplete.append(t)
+                if t not in NEWS_SOURCE_CACHE:
+                    missing.append(t)
+                    continue
+                articles = [{**a, "stale": True} for a in NEWS_SOURCE_CACHE[t]["data"]]
+            for article in articles:
+                key = article["id"] or article["title"]
+                if key and key not in all_news_map:
+                    all_news_map[key] = article
 
         processed_news = list(all_news_map.values())
+        if cluster:
+            processed_news = news_cluster.cluster_news(processed_news)
         processed_news.sort(key=lambda x: x.get('providerPublishTime', 0) or 0, reverse=True)
-        NEWS_CACHE[cache_key] = {"ts": time.time(), "data": processed_news}
+        ttl = min(market_calendar.cache_ttl(t, NEWS_CACHE_TTL, NEWS_CLOSED_MAX_TTL) for t in target_tickers)
+        if incomplete:
+            ttl = min(ttl, PARTIAL_CACHE_TTL)
+        if missing_sources is not None:
+            missing_sources.extend(missing)
+        NEWS_CACHE[cache_key] = {"ts": time.time(), "ttl": ttl, "data": processed_news, "missing": missing}
         return processed_news
 
     except Exception as e:
         return []
 
-def get_mini_chart(symbol: str):
+def get_mini_chart(symbol: str, timeout: float = None):
     """
     Get mini chart data for a ticker: current price, change %, and 5-day sparkline.
     """
+    import yfinance as yf
+
+    if circuit.is_open(circuit.YAHOO, symbol):
+        return None
+
     try:
-        ticker = yf.Ticker(symbol)
-        hist = ticker.history(period="5d", interval="1d")
+        hist = deadline.call(lambda: yf.Ticker(symbol).history(period="5d", interval="1d"), deadline.start(timeout))
         
         if hist.empty:
+            circuit.record_failure(circuit.YAHOO, symbol, upstream_error=False)
             return None
         
         sparkline = hist['Close'].tolist()
@@ -277,6 +563,7 @@ def get_mini_chart(symbol: str):
         change = current_price - prev_close
         change_percent = (change / prev_close * 100) if prev_close > 0 else 0
         
+        circuit.record_success(circuit.YAHOO, symbol)
         return {
             "symbol": symbol.upper(),
             "price": round(current_price, 2),
@@ -284,16 +571,20 @@ def get_mini_chart(symbol: str):
             "changePercent": round(change_percent, 2),
             "sparkline": [round(p, 2) for p in sparkline]
         }
+    except TimeoutError:
+        print(f"Mini chart timed out for {symbol}")
+        return None
     except Exception as e:
         print(f"Mini chart error for {symbol}: {e}")
+        circuit.record_failure(circuit.YAHOO, symbol, upstream_error=circuit.is_upstream_error(e))
         return None
 
-def get_economic_calendar():
+def get_economic_calendar(timeout: float = None):
     """
     Fetch upcoming economic events with caching and fallback.
     Strategy:
     1. Check local cache (valid for 12 hours)
-    2. Scrape ForexFactory
+    2. Scrape ForexFactory (within the request deadline)
     3. Fallback to hardcoded data
     """
     import json
@@ -318,9 +609,21 @@ def get_economic_calendar():
     except Exception as e:
         print(f"Cache read error: {e}")
 
-    # 2. Try Scraping ForexFactory
+    # 2. Try Scraping ForexFactory (skipped while its circuit is open)
     try:
-        events = scrape_forexfactory()
+        events = []
+        complete = False
+        if not circuit.is_open(circuit.FOREXFACTORY):
+            dl = deadline.start(timeout)
+            events = scrape_forexfactory(dl)
+            complete = not deadline.expired(dl)
+            if events:
+                circuit.record_success(circuit.FOREXFACTORY)
+            else:
+                circuit.record_failure(circuit.FOREXFACTORY)
+        if events and not complete:
+            # Partial scrape (deadline hit): serve it, but don't cache it for 12 hours
+            return events
         if events:
             # Save to cache
             try:
@@ -332,15 +635,17 @@ def get_economic_calendar():
             return events
     except Exception as e:
         print(f"Scraping failed: {e}")
+        circuit.record_failure(circuit.FOREXFACTORY)
 
     # 3. Fallback
     print("Using fallback economic calendar")
     return get_economic_calendar_fallback()
 
-def scrape_forexfactory():
+def scrape_forexfactory(dl: float = None):
     """
     Scrape economic calendar from ForexFactory for a short range.
     Range: Current month + Next 1 month (Total 2 months)
+    Months that cannot start before the deadline `dl` are skipped.
     """
     import requests
     from bs4 import BeautifulSoup
@@ -381,7 +686,13 @@ def scrape_forexfactory():
             url = f"https://www.forexfactory.com/calendar?month={month_str}"
             print(f"Fetching {url}...")
             
-            response = requests.get(url, headers=headers, timeout=8)
+            request_timeout = 8
+            if dl is not None:
+                request_timeout = min(request_timeout, deadline.remaining(dl))
+                if request_timeout <= 0:
+                    print(f"Deadline reached, skipping {month_str}")
+                    break
+            response = requests.get(url, headers=headers, timeout=request_timeout)
             response.raise_for_status()
             
             soup = BeautifulSoup(response.text, 'html.parser')
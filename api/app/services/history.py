@@ -0,0 +1,149 @@
+"""
+History Service Module
+
+Server-side portfolio value history:
+- One append-only binary file per client holding fixed-size
+  (timestamp, value) float64 records, 16 bytes per snapshot
+- Timestamps are unix milliseconds (same as the frontend history points)
+  and only ever increase, so range queries are a binary search over a
+  memory-mapped file instead of a full read
+- Ranges are downsampled with Largest-Triangle-Three-Buckets (LTTB) to the
+  requested point count, keeping the visual shape of the curve
+"""
+
+import hashlib
+import math
+import os
+import threading
+
+from fastapi import HTTPException
+
+HISTORY_DIR = os.getenv(
+    "HISTORY_DIR",
+    os.path.join(os.path.dirname(os.path.dirname(__file__)), "data", "history")
+)
+HISTORY_MIN_INTERVAL = int(os.getenv("HISTORY_MIN_INTERVAL", "5"))  # seconds between stored snapshots
+MAX_POINTS_PER_REQUEST = 1000  # snapshots accepted per append call
+MAX_QUERY_POINTS = 5000
+DEFAULT_QUERY_POINTS = 300
+
+_lock = threading.Lock()
+_last_ts = {}  # client -> timestamp of the newest stored snapshot
+
+def _np():
+    import numpy as np
+    return np
+
+def _dtype():
+    np = _np()
+    return np.dtype([("t", "<f8"), ("v", "<f8")])
+
+def _path(client_id: str) -> str:
+    # Client ids are opaque strings; hash them so they can never escape HISTORY_DIR
+    digest = hashlib.sha256(client_id.encode("utf-8")).hexdigest()[:32]
+    return os.path.join(HISTORY_DIR, f"{digest}.bin")
+
+def _load(client_id: str):
+    """Memory-map a client's history (None if there is none)."""
+    path = _path(client_id)
+    try:
+        records = os.path.getsize(path) // _dtype().itemsize
+    except OSError:
+        return None
+    if records == 0:
+        return None
+    return _np().memmap(path, dtype=_dtype(), mode="r", shape=(records,))
+
+def _last_timestamp(client_id: str) -> float:
+    if client_id not in _last_ts:
+        data = _load(client_id)
+        _last_ts[client_id] = float(data["t"][-1]) if data is not None else float("-inf")
+    return _last_ts[client_id]
+
+def append_points(client_id: str, points: list) -> dict:
+    """
+    Append (timestamp ms, value) snapshots for `client_id`. Points older than
+    the newest stored one, closer than HISTORY_MIN_INTERVAL to it, or not
+    finite (NaN / Infinity cannot be serialized back as JSON) are skipped.
+    """
+    if not client_id:
+        raise HTTPException(status_code=400, detail="clientId is required")
+    if len(points) > MAX_POINTS_PER_REQUEST:
+        raise HTTPException(status_code=400, detail=f"Too many points (max {MAX_POINTS_PER_REQUEST})")
+
+    np = _np()
+    min_gap = HISTORY_MIN_INTERVAL * 1000
+    with _lock:
+        last = _last_timestamp(client_id)
+        rows = []
+        for ts, value in sorted(points):
+            if not (math.isfinite(ts) and math.isfinite(value)) or ts - last < min_gap:
+                continue
+            rows.append((ts, value))
+            last = ts
+        if rows:
+            os.makedirs(HISTORY_DIR, exist_ok=True)
+            with open(_path(client_id), "ab") as f:
+                f.write(np.array(rows, dtype=_dtype()).tobytes())
+            _last_ts[client_id] = last
+    return {"stored": len(rows), "skipped": len(points) - len(rows)}
+
+def lttb(t, v, threshold: int):
+    """
+    Largest-Triangle-Three-Buckets downsampling of the series (t, v) to
+    `threshold` points. Returns the indices of the selected points.
+    """
+    np = _np()
+    n = len(t)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+
+    selected = np.empty(threshold, dtype=np.int64)
+    selected[0] = 0
+    selected[-1] = n - 1
+    # Interior points are split into threshold - 2 buckets; first/last are always kept
+    edges = np.linspace(1, n - 1, threshold - 1).astype(np.int64)
+    a = 0
+    for i in range(threshold - 2):
+        start, end = edges[i], edges[i + 1]
+        # Average of the next bucket (or the last point) is the third triangle vertex
+        if i + 2 < len(edges):
+            next_start, next_end = edges[i + 1], edges[i + 2]
+            avg_t = t[next_start:next_end].mean()
+            avg_v = v[next_start:next_end].mean()
+        else:
+            avg_t, avg_v = t[n - 1], v[n - 1]
+        bt, bv = t[start:end], v[start:end]
+        area = np.abs((t[a] - avg_t) * (bv - v[a]) - (t[a] - bt) * (avg_v - v[a]))
+        a = start + int(area.argmax())
+        selected[i + 1] = a
+    return selected
+
+def query(client_id: str, start: float = None, end: float = None, points: int = DEFAULT_QUERY_POINTS) -> dict:
+    """Snapshots in [start, end] (unix ms, inclusive) downsampled to at most `points`."""
+    points = min(max(points, 3), MAX_QUERY_POINTS)
+    data = _load(client_id)
+    if data is None:
+        return {"points": [], "total": 0}
+
+    np = _np()
+    ts = data["t"]
+    lo = 0 if start is None else int(np.searchsorted(ts, start, side="left"))
+    hi = len(data) if end is None else int(np.searchsorted(ts, end, side="right"))
+    t = np.asarray(ts[lo:hi], dtype=np.float64)
+    v = np.asarray(data["v"][lo:hi], dtype=np.float64)
+
+    idx = lttb(t, v, points)
+    return {
+        "points": [{"timestamp": int(a), "value": b} for a, b in zip(t[idx].tolist(), v[idx].tolist())],
+        "total": len(t),
+    }
+
+def delete_history(client_id: str) -> dict:
+    with _lock:
+        try:
+            os.remove(_path(client_id))
+        except FileNotFoundError:
+            raise HTTPException(status_code=404, detail="No history for this client")
+        _last_ts.pop(client_id, None)
+    return {"status": "deleted"}
@@ -0,0 +1,283 @@
+"""
+Market Calendar Module
+
+Server-side trading calendar used to pick cache TTLs per symbol:
+- Exchange trading sessions in local exchange time
+- Exchange holidays (rule-based for US, fixed-date and Easter-based for
+  the others; moving lunar holidays are only listed where known)
+- 24/7 crypto and 24/5 FX / futures
+- Short TTLs while trading, held until the next open while closed
+- Symbols on exchanges not listed here always get the short TTL
+"""
+
+import re
+from datetime import date, datetime, time as dtime, timedelta, timezone
+from zoneinfo import ZoneInfo
+
+# Keep the closing print fresh for a little while after the bell
+CLOSE_GRACE_SECONDS = 15 * 60
+
+# Each exchange: timezone, trading sessions (local time), trading weekdays (Mon=0)
+EXCHANGES = {
+    "US": {
+        "tz": "America/New_York",
+        "sessions": [(dtime(9, 30), dtime(16, 0))],
+        "weekdays": {0, 1, 2, 3, 4},
+    },
+    "SET": {
+        "tz": "Asia/Bangkok",
+        "sessions": [(dtime(10, 0), dtime(12, 30)), (dtime(14, 30), dtime(16, 30))],
+        "weekdays": {0, 1, 2, 3, 4},
+    },
+    "LSE": {
+        "tz": "Europe/London",
+        "sessions": [(dtime(8, 0), dtime(16, 30))],
+        "weekdays": {0, 1, 2, 3, 4},
+    },
+    "TSE": {
+        "tz": "Asia/Tokyo",
+        "sessions": [(dtime(9, 0), dtime(11, 30)), (dtime(12, 30), dtime(15, 30))],
+        "weekdays": {0, 1, 2, 3, 4},
+    },
+    "HKEX": {
+        "tz": "Asia/Hong_Kong",
+        "sessions": [(dtime(9, 30), dtime(12, 0)), (dtime(13, 0), dtime(16, 0))],
+        "weekdays": {0, 1, 2, 3, 4},
+    },
+    "ASX": {
+        "tz": "Australia/Sydney",
+        "sessions": [(dtime(10, 0), dtime(16, 0))],
+        "weekdays": {0, 1, 2, 3, 4},
+    },
+    "XETRA": {
+        "tz": "Europe/Berlin",
+        "sessions": [(dtime(9, 0), dtime(17, 30))],
+        "weekdays": {0, 1, 2, 3, 4},
+    },
+    # FX and CME futures trade around the clock from Sunday 17:00 to Friday 17:00 New York time
+    "FX": {
+        "tz": "America/New_York",
+        "weekly": ((6, dtime(17, 0)), (4, dtime(17, 0))),
+    },
+    "CRYPTO": {
+        "tz": "UTC",
+        "always_open": True,
+    },
+}
+
+# Fixed-date holidays (month, day). SET lunar holidays (Makha Bucha, Visakha Bucha,
+# Asarnha Bucha) move every year and are listed per year in EXTRA_HOLIDAYS.
+FIXED_HOLIDAYS = {
+    "SET": [(1, 1), (4, 6), (4, 13), (4, 14), (4, 15), (5, 1), (6, 3), (7, 28),
+            (8, 12), (10, 13), (10, 23), (12, 5), (12, 10), (12, 31)],
+    "LSE": [(1, 1), (12, 25), (12, 26)],
+    "TSE": [(1, 1), (1, 2), (1, 3), (12, 31)],
+    "HKEX": [(1, 1), (5, 1), (7, 1), (10, 1), (12, 25), (12, 26)],
+    "ASX": [(1, 1), (1, 26), (4, 25), (12, 25), (12, 26)],
+    "XETRA": [(1, 1), (5, 1), (12, 24), (12, 25), (12, 26), (12, 31)],
+}
+
+# Exchanges closed on Good Friday and Easter Monday
+EASTER_HOLIDAYS = {"LSE", "HKEX", "ASX", "XETRA"}
+
+# Symbol suffix / index -> exchange (suffixes as in symbols.SUFFIX_CURRENCIES)
+SUFFIX_EXCHANGES = {
+    ".BK": "SET", ".L": "LSE", ".T": "TSE", ".HK": "HKEX", ".AX": "ASX", ".DE": "XETRA",
+}
+INDEX_EXCHANGES = {
+    "^GSPC": "US", "^DJI": "US", "^IXIC": "US", "^NDX": "US", "^RUT": "US", "^VIX": "US",
+    "^SET.BK": "SET", "^SET": "SET", "^FTSE": "LSE", "^N225": "TSE", "^HSI": "HKEX",
+    "^AXJO": "ASX", "^GDAXI": "XETRA",
+}
+
+EXTRA_HOLIDAYS = {
+    "SET": {date(2026, 3, 3), date(2026, 6, 1), date(2026, 7, 29)},
+}
+
+# US share classes (BRK.B, BF.A); same rule as symbols._SHARE_CLASS
+_SHARE_CLASS = re.compile(r'^[A-Z]+\.[AB]$')
+
+_holiday_cache = {}
+
+def _easter(year: int) -> date:
+    """Gregorian Easter Sunday (anonymous algorithm)."""
+    a = year % 19
+    b, c = divmod(year, 100)
+    d, e = divmod(b, 4)
+    f = (b + 8) // 25
+    g = (b - f + 1) // 3
+    h = (19 * a + b - d - g + 15) % 30
+    i, k = divmod(c, 4)
+    l = (32 + 2 * e + 2 * i - h - k) % 7
+    m = (a + 11 * h + 22 * l) // 451
+    month, day = divmod(h + l - 7 * m + 114, 31)
+    return date(year, month, day + 1)
+
+def _nth_weekday(year: int, month: int, weekday: int, n: int) -> date:
+    """n-th `weekday` of the month; n=-1 for the last one."""
+    if n > 0:
+        first = date(year, month, 1)
+        return first + timedelta(days=(weekday - first.weekday()) % 7 + 7 * (n - 1))
+    last = (date(year, month + 1, 1) if month < 12 else date(year + 1, 1, 1)) - timedelta(days=1)
+    return last - timedelta(days=(last.weekday() - weekday) % 7)
+
+def _observed(d: date) -> date:
+    """NYSE rule: Saturday holidays move to Friday, Sunday holidays to Monday."""
+    if d.weekday() == 5:
+        return d - timedelta(days=1)
+    if d.weekday() == 6:
+        return d + timedelta(days=1)
+    return d
+
+def _us_holidays(year: int) -> set:
+    days = {
+        _nth_weekday(year, 1, 0, 3),    # Martin Luther King Jr. Day
+        _nth_weekday(year, 2, 0, 3),    # Presidents' Day
+        _easter(year) - timedelta(days=2),  # Good Friday
+        _nth_weekday(year, 5, 0, -1),   # Memorial Day
+        _observed(date(year, 6, 19)),   # Juneteenth
+        _observed(date(year, 7, 4)),    # Independence Day
+        _nth_weekday(year, 9, 0, 1),    # Labor Day
+        _nth_weekday(year, 11, 3, 4),   # Thanksgiving
+        _observed(date(year, 12, 25)),  # Christmas
+    }
+    # New Year's Day on a Saturday is not observed on the previous Friday
+    new_year = date(year, 1, 1)
+    if new_year.weekday() != 5:
+        days.add(_observed(new_year))
+    return days
+
+def holidays(exchange: str, year: int) -> set:
+    key = (exchange, year)
+    if key not in _holiday_cache:
+        if exchange == "US":
+            days = _us_holidays(year)
+        else:
+            days = {date(year, m, d) for m, d in FIXED_HOLIDAYS.get(exchange, [])}
+            if exchange in EASTER_HOLIDAYS:
+                easter = _easter(year)
+                days |= {easter - timedelta(days=2), easter + timedelta(days=1)}
+            if exchange == "LSE":
+                days |= {_nth_weekday(year, 5, 0, 1), _nth_weekday(year, 5, 0, -1),
+                         _nth_weekday(year, 8, 0, -1)}
+        days |= {d for d in EXTRA_HOLIDAYS.get(exchange, set()) if d.year == year}
+        _holiday_cache[key] = days
+    return _holiday_cache[key]
+
+def exchange_for_symbol(symbol: str):
+    """
+    Map a yfinance symbol to one of EXCHANGES. Plain tickers (and share
+    classes such as BRK.B) are US; unknown suffixes and indices give None.
+    """
+    s = (symbol or "").upper()
+    if s.endswith("-USD") or s.endswith("-USDT") or s.endswith("-THB"):
+        return "CRYPTO"
+    if s.endswith("=X") or s.endswith("=F") or s == "DX-Y.NYB":
+        return "FX"
+    if s.startswith("^"):
+        return INDEX_EXCHANGES.get(s)
+    if "." in s:
+        suffix = s[s.rindex("."):]
+        if suffix in SUFFIX_EXCHANGES:
+            return SUFFIX_EXCHANGES[suffix]
+        return "US" if _SHARE_CLASS.match(s) else None
+    return "US"
+
+def _local_now(exchange: str, now: datetime = None) -> datetime:
+    tz = ZoneInfo(EXCHANGES[exchange]["tz"])
+    if now is None:
+        return datetime.now(tz)
+    if now.tzinfo is None:
+        now = now.replace(tzinfo=timezone.utc)
+    return now.astimezone(tz)
+
+def _weekly_open(spec: dict, local: datetime) -> bool:
+    (open_day, open_time), (close_day, close_time) = spec["weekly"]
+    day = local.weekday()
+    if day == open_day:
+        return local.time() >= open_time
+    if day == close_day:
+        return local.time() < close_time
+    # Open on the days strictly between the weekly open and close
+    return (day - open_day) % 7 < (close_day - open_day) % 7
+
+def _sessions_on(exchange: str, d: date) -> list:
+    spec = EXCHANGES[exchange]
+    if d.weekday() not in spec["weekdays"] or d in holidays(exchange, d.year):
+        return []
+    return spec["sessions"]
+
+def is_open(exchange: str, now: datetime = None) -> bool:
+    spec = EXCHANGES[exchange]
+    if spec.get("always_open"):
+        return True
+    local = _local_now(exchange, now)
+    if "weekly" in spec:
+        return _weekly_open(spec, local)
+    return any(start <= local.time() < end for start, end in _sessions_on(exchange, local.date()))
+
+def seconds_until_open(exchange: str, now: datetime = None) -> float:
+    """Seconds until the next session opens (0 if open now)."""
+    if is_open(exchange, now):
+        return 0
+    spec = EXCHANGES[exchange]
+    local = _local_now(exchange, now)
+    tz = local.tzinfo
+
+    if "weekly" in spec:
+        open_day, open_time = spec["weekly"][0]
+        days_ahead = (open_day - local.weekday()) % 7
+        target = datetime.combine(local.date() + timedelta(days=days_ahead), open_time, tz)
+        if target <= local:
+            target += timedelta(days=7)
+        return (target - local).total_seconds()
+
+    for offset in range(0, 15):
+        d = local.date() + timedelta(days=offset)
+        for start, _ in _sessions_on(exchange, d):
+            target = datetime.combine(d, start, tz)
+            if target > local:
+                return (target - local).total_seconds()
+    return 24 * 60 * 60
+
+def seconds_since_close(exchange: str, now: datetime = None) -> float:
+    """Seconds since the most recent session close today (None if none yet)."""
+    spec = EXCHANGES[exchange]
+    if spec.get("always_open") or "weekly" in spec:
+        return None
+    local = _local_now(exchange, now)
+    closes = [datetime.combine(local.date(), end, local.tzinfo)
+              for _, end in _sessions_on(exchange, local.date())]
+    past = [c for c in closes if c <= local]
+    if not past:
+        return None
+    return (local - max(past)).total_seconds()
+
+def cache_ttl(symbol: str, open_ttl: float, closed_max_ttl: float = None, now: datetime = None) -> float:
+    """
+    TTL for data about `symbol`: `open_ttl` while its exchange trades (and
+    shortly after a close), otherwise until the next open, optionally capped
+    at `closed_max_ttl`.
+    """
+    exchange = exchange_for_symbol(symbol)
+    if exchange is None:
+        # Unknown trading hours: never hold data until some other market's open
+        return open_ttl
+    wait = seconds_until_open(exchange, now)
+    if wait <= 0:
+        return open_ttl
+    since_close = seconds_since_close(exchange, now)
+    if since_close is not None and since_close < CLOSE_GRACE_SECONDS:
+        return open_ttl
+    ttl = max(wait, open_ttl)
+    if closed_max_ttl is not None:
+        ttl = min(ttl, max(closed_max_ttl, open_ttl))
+    return ttl
+
+def market_status(symbols: list, now: datetime = None) -> dict:
+    """Open/closed state and next open for the exchanges of `symbols`."""
+    exchanges = {exchange_for_symbol(s) for s in symbols} - {None} if symbols else set(EXCHANGES)
+    return {
+        ex: {"open": is_open(ex, now), "secondsUntilOpen": round(seconds_until_open(ex, now))}
+        for ex in sorted(exchanges)
+    }
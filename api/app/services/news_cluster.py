@@ -0,0 +1,144 @@
+"""
+News Clustering Module
+
+Groups near-duplicate stories (the same wire story syndicated by several
+publishers) so feeds and LLM prompts only carry one representative each:
+- Titles/summaries are normalized into token sets
+- MinHash signatures + LSH banding find candidate pairs without comparing
+  every pair of stories
+- Candidates are confirmed with exact Jaccard similarity and merged with
+  union-find
+"""
+
+import hashlib
+import re
+
+NUM_PERM = 32
+BANDS = 16
+ROWS = NUM_PERM // BANDS
+
+# Confirmed duplicate if titles overlap this much...
+TITLE_THRESHOLD = 0.6
+# ...or titles overlap moderately and summaries overlap strongly
+TITLE_WITH_SUMMARY_THRESHOLD = 0.35
+SUMMARY_THRESHOLD = 0.5
+
+_MERSENNE_PRIME = (1 << 61) - 1
+_MAX_HASH = (1 << 32) - 1
+
+# Fixed permutation coefficients so signatures are stable across processes
+_PERMUTATIONS = [
+    (int.from_bytes(hashlib.blake2b(f"a{i}".encode(), digest_size=8).digest(), "big") % (_MERSENNE_PRIME - 1) + 1,
+     int.from_bytes(hashlib.blake2b(f"b{i}".encode(), digest_size=8).digest(), "big") % _MERSENNE_PRIME)
+    for i in range(NUM_PERM)
+]
+
+STOPWORDS = {
+    'a', 'an', 'the', 'and', 'or', 'of', 'to', 'in', 'on', 'for', 'at', 'by', 'with',
+    'from', 'as', 'is', 'are', 'was', 'be', 'its', 'it', 'this', 'that', 'after',
+    'amid', 'says', 'said', 'will', 'has', 'have', 'over', 'into', 'new', 'why', 'how',
+    'what', 'here', 's'
+}
+
+_TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+
+def normalize_tokens(text: str) -> frozenset:
+    """Lowercase, strip punctuation and stopwords, fold simple plurals."""
+    if not text:
+        return frozenset()
+    tokens = set()
+    for tok in _TOKEN_PATTERN.findall(text.lower()):
+        if tok in STOPWORDS:
+            continue
+        if len(tok) > 3 and tok.endswith('s') and not tok.endswith('ss'):
+            tok = tok[:-1]
+        tokens.add(tok)
+    return frozenset(tokens)
+
+def _hash_token(token: str) -> int:
+    return int.from_bytes(hashlib.blake2b(token.encode(), digest_size=8).digest(), "big")
+
+def minhash(tokens: frozenset) -> tuple:
+    if not tokens:
+        return ()
+    hashes = [_hash_token(t) for t in tokens]
+    return tuple(
+        min(((a * h + b) % _MERSENNE_PRIME) & _MAX_HASH for h in hashes)
+        for a, b in _PERMUTATIONS
+    )
+
+def jaccard(a: frozenset, b: frozenset) -> float:
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+def group(items: list, title_of, summary_of=None) -> list:
+    """
+    Cluster `items` into lists of near-duplicates, preserving input order
+    (both of the clusters and of the items inside each cluster).
+    """
+    titles = [normalize_tokens(title_of(item)) for item in items]
+    summaries = [normalize_tokens(summary_of(item)) if summary_of else frozenset() for item in items]
+
+    parent = list(range(len(items)))
+
+    def find(i):
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    buckets = {}
+    for idx, tokens in enumerate(titles):
+        sig = minhash(tokens)
+        if not sig:
+            continue
+        for band in range(BANDS):
+            key = (band, sig[band * ROWS:(band + 1) * ROWS])
+            buckets.setdefault(key, []).append(idx)
+
+    checked = set()
+    for members in buckets.values():
+        for pos, i in enumerate(members):
+            for j in members[pos + 1:]:
+                if (i, j) in checked:
+                    continue
+                checked.add((i, j))
+                root_i, root_j = find(i), find(j)
+                if root_i == root_j:
+                    continue
+                title_sim = jaccard(titles[i], titles[j])
+                if title_sim >= TITLE_THRESHOLD or (
+                    title_sim >= TITLE_WITH_SUMMARY_THRESHOLD
+                    and jaccard(summaries[i], summaries[j]) >= SUMMARY_THRESHOLD
+                ):
+                    parent[max(root_i, root_j)] = min(root_i, root_j)
+
+    clusters = {}
+    for idx in range(len(items)):
+        clusters.setdefault(find(idx), []).append(items[idx])
+    return list(clusters.values())
+
+def cluster_news(news: list) -> list:
+    """
+    Collapse near-duplicate articles (dicts from finance.get_market_news) into
+    one representative each, annotated with `sourceCount` and `publishers`.
+    """
+    results = []
+    for members in group(news, lambda n: n.get("title"), lambda n: n.get("summary")):
+        # Prefer the richest article (summary + thumbnail), then feed order
+        rep = min(members, key=lambda n: (not n.get("summary"), not n.get("thumbnail")))
+        rep = dict(rep)
+        publishers = []
+        tickers = list(rep.get("relatedTickers") or [])
+        for n in members:
+            if n.get("publisher") and n["publisher"] not in publishers:
+                publishers.append(n["publisher"])
+            for t in n.get("relatedTickers") or []:
+                if t not in tickers:
+                    tickers.append(t)
+        rep["sourceCount"] = len(members)
+        rep["publishers"] = publishers
+        rep["relatedTickers"] = tickers[:5]
+        results.append(rep)
+    return results
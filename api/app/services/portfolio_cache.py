@@ -0,0 +1,97 @@
+"""
+Portfolio Analysis Cache Module
+
+Reuses completed portfolio analyses across small portfolio changes:
+- A portfolio is normalized into a fingerprint: per-holding weights rounded
+  into WEIGHT_BUCKET buckets, sector weights, strategy mode, language and
+  model. Share-count tweaks and price moves usually leave it unchanged
+- Everything is scoped to the requesting client: reports quote exact
+  holdings and amounts, so they are never shared between clients
+- Exact fingerprint matches return the cached report as is
+- Otherwise the closest cached full report of the same client and
+  mode/language/model is found by weight drift (share of the portfolio
+  that moved); within NEAR_MATCH_MAX_DRIFT the caller only generates a
+  short delta commentary
+"""
+
+import hashlib
+import json
+import threading
+import time
+
+WEIGHT_BUCKET = 0.05  # 5% of portfolio value
+NEAR_MATCH_MAX_DRIFT = 0.20  # at most 20% of the portfolio reallocated
+ANALYSIS_CACHE_TTL = 6 * 3600  # seconds
+MAX_CACHED_ANALYSES = 500
+
+# fingerprint -> {"ts", "ttl", "data": {"analysis", "weights", "scope", "full"}}
+ANALYSIS_CACHE = {}
+_lock = threading.Lock()
+
+def _bucket(weight: float) -> float:
+    return round(round(weight / WEIGHT_BUCKET) * WEIGHT_BUCKET, 4)
+
+def _shares(portfolio) -> list:
+    """(symbol, sector, share of total value) per holding."""
+    total = sum(max(item.value, 0) for item in portfolio)
+    return [
+        (item.symbol.strip().upper(), item.sector or "Unknown",
+         max(item.value, 0) / total if total > 0 else 1 / len(portfolio))
+        for item in portfolio
+    ]
+
+def fingerprint(portfolio, client_id: str, mode: str, language: str, model: str):
+    """Return (fingerprint, weights, scope); scope is the client/mode/language/model part."""
+    weights, sectors = {}, {}
+    for symbol, sector, share in _shares(portfolio):
+        weights[symbol] = weights.get(symbol, 0) + share
+        sectors[sector] = sectors.get(sector, 0) + share
+    client = hashlib.sha256(client_id.encode("utf-8")).hexdigest()[:32]
+    scope = f"{client}|{mode}|{language}|{model}"
+    canonical = json.dumps({
+        "scope": scope,
+        "weights": sorted((s, _bucket(w)) for s, w in weights.items()),
+        "sectors": sorted((s, _bucket(w)) for s, w in sectors.items()),
+    }, separators=(",", ":"))
+    return hashlib.sha1(canonical.encode()).hexdigest(), weights, scope
+
+def drift(old: dict, new: dict) -> float:
+    """Fraction of the portfolio that was reallocated (half the L1 distance of the weights)."""
+    symbols = old.keys() | new.keys()
+    return sum(abs(old.get(s, 0) - new.get(s, 0)) for s in symbols) / 2
+
+def get_exact(key: str):
+    with _lock:
+        cached = ANALYSIS_CACHE.get(key)
+        if cached and time.time() - cached["ts"] < cached["ttl"]:
+            return cached["data"]
+    return None
+
+def get_nearest(scope: str, weights: dict):
+    """Closest cached full report in `scope` within NEAR_MATCH_MAX_DRIFT, or None."""
+    now = time.time()
+    best, best_drift = None, NEAR_MATCH_MAX_DRIFT
+    with _lock:
+        for cached in ANALYSIS_CACHE.values():
+            data = cached["data"]
+            # Deltas are only ever built on full reports so they cannot pile up
+            if not data["full"] or data["scope"] != scope or now - cached["ts"] >= cached["ttl"]:
+                continue
+            d = drift(data["weights"], weights)
+            if d <= best_drift:
+                best, best_drift = data, d
+    return best
+
+def store(key: str, scope: str, weights: dict, analysis: str, full: bool):
+    with _lock:
+        if key not in ANALYSIS_CACHE and len(ANALYSIS_CACHE) >= MAX_CACHED_ANALYSES:
+            now = time.time()
+            for k in [k for k, v in ANALYSIS_CACHE.items() if now - v["ts"] >= v["ttl"]]:
+                del ANALYSIS_CACHE[k]
+            if len(ANALYSIS_CACHE) >= MAX_CACHED_ANALYSES:
+                del ANALYSIS_CACHE[min(ANALYSIS_CACHE, key=lambda k: ANALYSIS_CACHE[k]["ts"])]
+        ANALYSIS_CACHE[key] = {
+            "ts": time.time(),
+            "ttl": ANALYSIS_CACHE_TTL,
+            "data": {"analysis": analysis, "weights": weights, "scope": scope, "full": full},
+        }
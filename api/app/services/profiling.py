@@ -0,0 +1,158 @@
+"""
+Profiling Module
+
+On-demand request profiling for hot-path investigation:
+- Requires PROFILE_ADMIN_TOKEN. Enabled per request with the token in
+  `X-Admin-Token`, or for a random PROFILE_SAMPLE_RATE fraction of requests
+- A sampling profiler snapshots every thread's Python stack while the
+  request is in flight, so time spent on the upstream worker pool
+  (yfinance, pandas) shows up next to the handler and response encoding
+- Idle threads (blocked outside app code) are left out; concurrent
+  requests can still appear in the same profile
+- The last PROFILE_BUFFER_SIZE profiles are kept in memory and served as
+  collapsed stacks (flamegraph.pl / speedscope / inferno format)
+Without PROFILE_ADMIN_TOKEN the middleware is not installed at all.
+"""
+
+import hmac
+import itertools
+import os
+import random
+import sys
+import threading
+import time
+from collections import Counter, deque
+
+from fastapi import HTTPException
+
+PROFILE_ADMIN_TOKEN = os.getenv("PROFILE_ADMIN_TOKEN", "")
+PROFILE_SAMPLE_RATE = float(os.getenv("PROFILE_SAMPLE_RATE", "0"))  # 0..1
+PROFILE_BUFFER_SIZE = int(os.getenv("PROFILE_BUFFER_SIZE", "20"))
+
+# Profiles can only be read with the admin token, so sampling without one is pointless overhead
+if PROFILE_SAMPLE_RATE > 0 and not PROFILE_ADMIN_TOKEN:
+    print("Profiling disabled: PROFILE_SAMPLE_RATE needs PROFILE_ADMIN_TOKEN to be set")
+    PROFILE_SAMPLE_RATE = 0
+PROFILING_ENABLED = bool(PROFILE_ADMIN_TOKEN)
+
+SAMPLE_INTERVAL = 0.005  # seconds
+MAX_PROFILE_SECONDS = 30  # stop sampling long-running (e.g. streaming) requests
+
+ADMIN_HEADER = "x-admin-token"
+
+_APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# Leaf frames that mean "blocked, doing nothing" when no app code is on the stack
+_IDLE_LEAVES = {"wait", "select", "get", "_worker", "sleep", "accept"}
+
+_ids = itertools.count(1)
+_profiles = deque(maxlen=PROFILE_BUFFER_SIZE)
+_active = threading.Lock()  # one sampler at a time
+
+def is_admin(token: str) -> bool:
+    # Compare bytes: compare_digest raises TypeError on non-ASCII str
+    return bool(PROFILE_ADMIN_TOKEN) and bool(token) and hmac.compare_digest(token.encode(), PROFILE_ADMIN_TOKEN.encode())
+
+def should_profile(request):
+    """Return the trigger ("header" / "sampled") if this request should be profiled, else None."""
+    if is_admin(request.headers.get(ADMIN_HEADER)):
+        return "header"
+    if PROFILE_SAMPLE_RATE > 0 and random.random() < PROFILE_SAMPLE_RATE:
+        return "sampled"
+    return None
+
+def _frame_label(code) -> str:
+    filename = code.co_filename
+    if filename.startswith(_APP_DIR):
+        filename = "app" + filename[len(_APP_DIR):].replace(os.sep, "/")
+    else:
+        filename = os.path.basename(filename)
+    return f"{code.co_name} ({filename}:{code.co_firstlineno})"
+
+class Sampler:
+    """Background thread collecting collapsed stacks from all other threads."""
+
+    def __init__(self, trigger: str):
+        self.trigger = trigger
+        self.stacks = Counter()
+        self.samples = 0
+        self.started = self.duration = 0.0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="profiler", daemon=True)
+
+    def start(self):
+        self.started = time.perf_counter()
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+        self.duration = time.perf_counter() - self.started
+
+    def _run(self):
+        own = threading.get_ident()
+        names = {}
+        deadline = time.perf_counter() + MAX_PROFILE_SECONDS
+        while not self._stop.wait(SAMPLE_INTERVAL) and time.perf_counter() < deadline:
+            self.samples += 1
+            for ident, frame in sys._current_frames().items():
+                if ident == own:
+                    continue
+                leaf = frame.f_code.co_name
+                codes = []
+                in_app = False
+                while frame is not None:
+                    codes.append(frame.f_code)
+                    in_app = in_app or frame.f_code.co_filename.startswith(_APP_DIR)
+                    frame = frame.f_back
+                if leaf in _IDLE_LEAVES and not in_app:
+                    continue
+                if ident not in names:
+                    names = {t.ident: t.name for t in threading.enumerate()}
+                stack = [names.get(ident, str(ident))]
+                stack.extend(_frame_label(code) for code in reversed(codes))
+                self.stacks[";".join(stack)] += 1
+
+def start(trigger: str):
+    """Start a sampler for one request; None if another profile is already running."""
+    if not _active.acquire(blocking=False):
+        return None
+    sampler = Sampler(trigger)
+    sampler.start()
+    return sampler
+
+def finish(sampler: Sampler, request, status_code: int) -> int:
+    """Stop `sampler`, store the profile and return its id."""
+    try:
+        sampler.stop()
+    finally:
+        _active.release()
+    profile_id = next(_ids)
+    _profiles.append({
+        "id": profile_id,
+        "method": request.method,
+        "path": request.url.path,
+        "query": request.url.query,
+        "status": status_code,
+        "trigger": sampler.trigger,
+        "durationMs": round(sampler.duration * 1000, 1),
+        "samples": sampler.samples,
+        "startedAt": time.time() - sampler.duration,
+        "stacks": sampler.stacks,
+    })
+    return profile_id
+
+def list_profiles() -> list:
+    return [{k: v for k, v in p.items() if k != "stacks"} for p in reversed(_profiles)]
+
+def collapsed(profile_id: int) -> str:
+    """Profile in collapsed-stack format: `frame;frame;frame count` per line."""
+    for p in _profiles:
+        if p["id"] == profile_id:
+            return "".join(f"{stack} {count}\n" for stack, count in p["stacks"].most_common())
+    raise HTTPException(status_code=404, detail="Profile not found")
+
+def require_admin(token: str):
+    if not PROFILE_ADMIN_TOKEN:
+        raise HTTPException(status_code=404, detail="Profiling is disabled")
+    if not is_admin(token):
+        raise HTTPException(status_code=403, detail="Invalid admin token")
@@ -0,0 +1,125 @@
+"""
+Rate Limit Module
+
+Per-client token-bucket rate limiting and admission control:
+- Routes are grouped into classes by cost (cached reads, upstream-bound, LLM)
+- Each client gets one token bucket per class; batch endpoints
+  (/api/prices, /api/symbols/resolve) are charged by item count
+- Each class also has a global cap on in-flight requests so bursts from
+  many clients cannot pile up behind Yahoo/Groq
+Used by the HTTP middleware in app.main; state lives in process memory.
+"""
+
+import math
+import os
+import time
+
+from fastapi import HTTPException
+
+RATE_LIMIT_ENABLED = os.getenv("RATE_LIMIT_ENABLED", "1").lower() in ("1", "true", "yes")
+# Only trust X-Forwarded-For when running behind a known reverse proxy
+TRUST_FORWARDED_FOR = os.getenv("TRUST_FORWARDED_FOR", "0").lower() in ("1", "true", "yes")
+
+CHEAP = "cheap"
+UPSTREAM = "upstream"
+LLM = "llm"
+
+# class -> (tokens per second, burst size, max in-flight across all clients)
+LIMITS = {
+    CHEAP: (20.0, 60, None),
+    UPSTREAM: (5.0, 30, 32),
+    LLM: (10 / 60, 3, 8),
+}
+
+LLM_PATHS = ("/api/chat", "/api/news/analyze", "/analyze")
+UPSTREAM_PATHS = (
+    "/api/prices", "/api/search", "/api/info", "/api/news", "/api/mini-chart",
+    "/api/economic-calendar", "/api/symbols/resolve",
+)
+
+MAX_BUCKETS = 10000
+# Batch upstream endpoints are charged one token per ITEMS_PER_TOKEN items
+# (capped at the bucket size, so a maximal batch empties the bucket)
+ITEMS_PER_TOKEN = 10
+
+# (client, class) -> {"tokens": float, "ts": float}
+_buckets = {}
+_in_flight = {CHEAP: 0, UPSTREAM: 0, LLM: 0}
+
+def route_class(path: str) -> str:
+    if path.startswith(LLM_PATHS):
+        return LLM
+    if path.startswith(UPSTREAM_PATHS):
+        return UPSTREAM
+    return CHEAP
+
+def client_id(request) -> str:
+    if TRUST_FORWARDED_FOR:
+        forwarded = request.headers.get("x-forwarded-for")
+        if forwarded:
+            return forwarded.split(",")[0].strip()
+    return request.client.host if request.client else "unknown"
+
+def _evict_idle(now: float):
+    """Drop buckets that have refilled completely; they carry no state."""
+    for key in list(_buckets):
+        rate, burst, _ = LIMITS[key[1]]
+        b = _buckets[key]
+        if b["tokens"] + (now - b["ts"]) * rate >= burst:
+            del _buckets[key]
+
+def take(client: str, cls: str, cost: float = 1.0) -> float:
+    """
+    Try to take `cost` tokens. Returns 0 if admitted, otherwise the number of
+    seconds until enough tokens will be available.
+    """
+    rate, burst, _ = LIMITS[cls]
+    now = time.monotonic()
+    key = (client, cls)
+    bucket = _buckets.get(key)
+    if bucket is None:
+        if len(_buckets) >= MAX_BUCKETS:
+            _evict_idle(now)
+        bucket = _buckets[key] = {"tokens": float(burst), "ts": now}
+    else:
+        bucket["tokens"] = min(burst, bucket["tokens"] + (now - bucket["ts"]) * rate)
+        bucket["ts"] = now
+
+    if bucket["tokens"] >= cost:
+        bucket["tokens"] -= cost
+        return 0
+    return (cost - bucket["tokens"]) / rate
+
+def item_cost(cls: str, items: int) -> float:
+    return min(float(LIMITS[cls][1]), max(1.0, math.ceil(items / ITEMS_PER_TOKEN)))
+
+def charge_items(request, items: int):
+    """
+    Charge a batch request by item count. The middleware already took one
+    token; the rest is taken here, with a 429 if the bucket cannot cover it.
+    """
+    if not RATE_LIMIT_ENABLED:
+        return
+    extra = item_cost(UPSTREAM, items) - 1
+    if extra <= 0:
+        return
+    wait = take(client_id(request), UPSTREAM, extra)
+    if wait:
+        raise HTTPException(
+            status_code=429,
+            detail="Too many requests. Please slow down.",
+            headers={"Retry-After": retry_after_header(wait)}
+        )
+
+def acquire_slot(cls: str) -> bool:
+    cap = LIMITS[cls][2]
+    if cap is not None and _in_flight[cls] >= cap:
+        return False
+    _in_flight[cls] += 1
+    return True
+
+def release_slot(cls: str):
+    _in_flight[cls] -= 1
+
+def retry_after_header(seconds: float) -> str:
+    return str(max(1, math.ceil(seconds)))
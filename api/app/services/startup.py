@@ -0,0 +1,89 @@
+"""
+Startup Module
+
+Tracks cold-start timings and runs the optional background warm-up:
+- Import time of the application package
+- Time to first served request
+- Warm-up of heavy modules, the symbol index and hot caches
+"""
+
+import os
+import threading
+import time
+
+# Enable with WARMUP_ON_STARTUP=1; symbols are comma separated
+WARMUP_ON_STARTUP = os.getenv("WARMUP_ON_STARTUP", "0").lower() in ("1", "true", "yes")
+WARMUP_SYMBOLS = os.getenv("WARMUP_SYMBOLS", "^GSPC,^DJI,^IXIC,BTC-USD,ETH-USD,EURUSD=X")
+
+STARTUP_METRICS = {
+    "importSeconds": None,
+    "timeToFirstRequestSeconds": None,
+    "warmup": {"enabled": WARMUP_ON_STARTUP, "status": "disabled", "steps": {}},
+}
+
+_import_started_at = None
+_first_request_lock = threading.Lock()
+
+def mark_import_started(started_at: float):
+    global _import_started_at
+    _import_started_at = started_at
+
+def mark_import_finished():
+    started = _import_started_at
+    if started is not None:
+        STARTUP_METRICS["importSeconds"] = round(time.perf_counter() - started, 4)
+        print(f"App import took {STARTUP_METRICS['importSeconds']}s")
+
+def mark_request_served():
+    """Record time-to-first-request once; later calls are a cheap no-op."""
+    if STARTUP_METRICS["timeToFirstRequestSeconds"] is not None:
+        return
+    with _first_request_lock:
+        started = _import_started_at
+        if STARTUP_METRICS["timeToFirstRequestSeconds"] is None and started is not None:
+            STARTUP_METRICS["timeToFirstRequestSeconds"] = round(time.perf_counter() - started, 4)
+            print(f"First request served {STARTUP_METRICS['timeToFirstRequestSeconds']}s after import start")
+
+def _timed_step(name: str, fn):
+    started = time.perf_counter()
+    try:
+        fn()
+        status = "ok"
+    except Exception as e:
+        print(f"Warm-up step {name} failed: {e}")
+        status = "error"
+    STARTUP_METRICS["warmup"]["steps"][name] = {
+        "status": status,
+        "seconds": round(time.perf_counter() - started, 4),
+    }
+
+def _import_heavy_modules():
+    import yfinance  # noqa: F401  (pulls in pandas)
+    import requests  # noqa: F401
+    import bs4  # noqa: F401
+
+def _run_warmup():
+    from . import ai, finance, symbols
+
+    warmup = STARTUP_METRICS["warmup"]
+    warmup["status"] = "running"
+    started = time.perf_counter()
+
+    _timed_step("modules", _import_heavy_modules)
+    _timed_step("symbolIndex", symbols.get_symbol_index)
+    _timed_step("groqClient", ai.get_client)
+    if WARMUP_SYMBOLS.strip():
+        _timed_step("prices", lambda: finance.get_current_prices(WARMUP_SYMBOLS))
+    _timed_step("news", lambda: finance.get_market_news("general"))
+
+    warmup["seconds"] = round(time.perf_counter() - started, 4)
+    warmup["status"] = "done"
+    print(f"Warm-up finished in {warmup['seconds']}s")
+
+def start_warmup():
+    """Start the warm-up in a daemon thread if enabled. Never blocks startup."""
+    if not WARMUP_ON_STARTUP:
+        return None
+    thread = threading.Thread(target=_run_warmup, name="warmup", daemon=True)
+    thread.start()
+    return thread
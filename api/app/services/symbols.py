@@ -0,0 +1,121 @@
+"""
+Symbol Index Module
+
+Local lookup table of well-known tickers (S&P 500, Nasdaq 100, Dow Jones,
+major indices/ETFs and crypto) so common symbols can be recognised without
+a round trip to Yahoo. Mirrors `src/constants/assets.js` on the frontend.
+"""
+
+import json
+import os
+import re
+import threading
+
+SYMBOL_INDEX_PATH = os.getenv(
+    "SYMBOL_INDEX_PATH",
+    os.path.join(os.path.dirname(os.path.dirname(__file__)), "data", "symbols.json")
+)
+
+# Manual overrides or additions not in the scraped list (same as MANUAL_DB on the frontend)
+MANUAL_SYMBOLS = {
+    'AAPL': {'name': 'Apple Inc.', 'type': 'Stock'},
+    'TSLA': {'name': 'Tesla, Inc.', 'type': 'Stock'},
+    'MSFT': {'name': 'Microsoft Corp.', 'type': 'Stock'},
+    'GOOGL': {'name': 'Alphabet Inc.', 'type': 'Stock'},
+    'AMZN': {'name': 'Amazon.com', 'type': 'Stock'},
+    'NVDA': {'name': 'NVIDIA Corp.', 'type': 'Stock'},
+    'META': {'name': 'Meta Platforms', 'type': 'Stock'},
+    'CRWV': {'name': 'CoreWeave, Inc.', 'type': 'Stock'},
+
+    '^GSPC': {'name': 'S&P 500 Index', 'type': 'Index'},
+    '^NDX': {'name': 'NASDAQ 100 Index', 'type': 'Index'},
+    '^DJI': {'name': 'Dow Jones Industrial Average', 'type': 'Index'},
+    'DIA': {'name': 'SPDR Dow Jones ETF', 'type': 'ETF'},
+    'SPY': {'name': 'SPDR S&P 500 ETF', 'type': 'ETF'},
+    'VOO': {'name': 'Vanguard S&P 500', 'type': 'ETF'},
+    'QQQ': {'name': 'Invesco QQQ', 'type': 'ETF'},
+
+    'BTC': {'name': 'Bitcoin', 'type': 'Crypto', 'yfSymbol': 'BTC-USD'},
+    'ETH': {'name': 'Ethereum', 'type': 'Crypto', 'yfSymbol': 'ETH-USD'},
+    'SOL': {'name': 'Solana', 'type': 'Crypto', 'yfSymbol': 'SOL-USD'},
+    'BNB': {'name': 'Binance Coin', 'type': 'Crypto', 'yfSymbol': 'BNB-USD'},
+    'USDT': {'name': 'Tether', 'type': 'Crypto', 'yfSymbol': 'USDT-USD'},
+}
+
+# Exchange suffix -> trading currency, for symbols not covered by the index
+SUFFIX_CURRENCIES = {
+    '.BK': 'THB', '.L': 'GBP', '.T': 'JPY', '.HK': 'HKD', '.SI': 'SGD',
+    '.TO': 'CAD', '.V': 'CAD', '.AX': 'AUD', '.DE': 'EUR', '.PA': 'EUR',
+    '.AS': 'EUR', '.MI': 'EUR', '.SW': 'CHF', '.KS': 'KRW', '.TW': 'TWD',
+    '.SS': 'CNY', '.SZ': 'CNY', '.NS': 'INR', '.BO': 'INR',
+}
+
+# Corporate suffixes ignored when matching by company name
+NAME_NOISE = {'inc', 'corp', 'corporation', 'co', 'company', 'ltd', 'limited', 'plc',
+              'holdings', 'holding', 'group', 'the', 'class', 'sa', 'nv', 'ag', 'lp'}
+
+_SHARE_CLASS = re.compile(r'^([A-Z]+)\.([AB])$')
+
+_index = None
+_name_index = None
+_index_lock = threading.Lock()
+
+def get_symbol_index() -> dict:
+    """Return the symbol index, loading it from disk on first use."""
+    global _index
+    if _index is None:
+        with _index_lock:
+            if _index is None:
+                index = {}
+                try:
+                    with open(SYMBOL_INDEX_PATH, 'r') as f:
+                        index.update(json.load(f))
+                except Exception as e:
+                    print(f"Symbol index load error: {e}")
+                index.update(MANUAL_SYMBOLS)
+                _index = index
+    return _index
+
+def lookup_symbol(symbol: str):
+    """Return the index entry for `symbol` (case-insensitive) or None."""
+    if not symbol:
+        return None
+    return get_symbol_index().get(symbol.strip().upper())
+
+def normalize_name(name: str) -> str:
+    words = re.findall(r'[a-z0-9]+', (name or '').lower())
+    return ' '.join(w for w in words if w not in NAME_NOISE)
+
+def lookup_name(name: str):
+    """Return (symbol, entry) for an exact (normalized) company name match, or None."""
+    global _name_index
+    if _name_index is None:
+        names = {}
+        for sym, entry in get_symbol_index().items():
+            key = normalize_name(entry.get('name'))
+            if key:
+                names.setdefault(key, sym)
+        _name_index = names
+    sym = _name_index.get(normalize_name(name))
+    if sym is None:
+        return None
+    return sym, get_symbol_index()[sym]
+
+def to_yf_symbol(symbol: str, entry: dict = None) -> str:
+    """Canonical yfinance symbol (crypto overrides, BRK.B -> BRK-B)."""
+    if entry and entry.get('yfSymbol'):
+        return entry['yfSymbol']
+    match = _SHARE_CLASS.match(symbol)
+    if match:
+        return f"{match.group(1)}-{match.group(2)}"
+    return symbol
+
+def currency_for_symbol(symbol: str) -> str:
+    s = (symbol or '').upper()
+    if '=X' in s:
+        # e.g. EURUSD=X is quoted in USD, THB=X in THB
+        return s[3:6] if len(s) >= 8 else s[:3]
+    for suffix, currency in SUFFIX_CURRENCIES.items():
+        if s.endswith(suffix):
+            return currency
+    return 'USD'
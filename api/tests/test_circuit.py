@@ -0,0 +1,55 @@
+from unittest import mock
+
+import pytest
+
+from app.services import circuit
+
+
+@pytest.fixture(autouse=True)
+def clean_state():
+    circuit._symbol_state.clear()
+    circuit._upstream_state.clear()
+    yield
+    circuit._symbol_state.clear()
+    circuit._upstream_state.clear()
+
+
+def test_symbol_errors_do_not_open_upstream():
+    for i in range(circuit.UPSTREAM_FAILURE_THRESHOLD * 2):
+        circuit.record_failure("yahoo", f"BAD{i}", upstream_error=False)
+    assert not circuit.is_open("yahoo")
+    assert circuit.is_open("yahoo", "BAD0")
+
+
+def test_half_open_failure_doubles_ttl():
+    with mock.patch("time.time", return_value=1000.0):
+        for _ in range(circuit.UPSTREAM_FAILURE_THRESHOLD):
+            circuit.record_failure("yahoo")
+        assert circuit.retry_after("yahoo") == circuit.UPSTREAM_BASE_TTL
+    # After the TTL a single failed trial reopens the breaker for twice as long
+    with mock.patch("time.time", return_value=1000.0 + circuit.UPSTREAM_BASE_TTL + 1):
+        assert not circuit.is_open("yahoo")
+        circuit.record_failure("yahoo")
+        assert circuit.retry_after("yahoo") == 2 * circuit.UPSTREAM_BASE_TTL
+        circuit.record_success("yahoo")
+        assert not circuit.is_open("yahoo")
+
+
+def test_symbol_state_is_bounded():
+    with mock.patch.object(circuit, "SYMBOL_MAX_ENTRIES", 100):
+        for i in range(1000):
+            circuit.record_failure("yahoo", f"SYM{i}", upstream_error=False)
+        assert len(circuit._symbol_state) <= 100
+        assert circuit.is_open("yahoo", "SYM999")
+
+
+def test_is_upstream_error():
+    class HTTPError(Exception):
+        def __init__(self, status):
+            self.response = mock.Mock(status_code=status)
+
+    assert circuit.is_upstream_error(TimeoutError())
+    assert circuit.is_upstream_error(HTTPError(429))
+    assert circuit.is_upstream_error(HTTPError(503))
+    assert not circuit.is_upstream_error(HTTPError(404))
+    assert not circuit.is_upstream_error(KeyError("currentTradingPeriod"))
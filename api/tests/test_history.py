@@ -0,0 +1,50 @@
+import numpy as np
+import pytest
+
+from app.services import history
+
+
+@pytest.fixture(autouse=True)
+def history_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(history, "HISTORY_DIR", str(tmp_path))
+    history._last_ts.clear()
+    yield
+    history._last_ts.clear()
+
+
+def _series(n):
+    t = np.arange(n, dtype=np.float64) * 1000
+    v = np.sin(np.arange(n) / 7.0) * 100 + np.arange(n)
+    return t, v
+
+
+@pytest.mark.parametrize("threshold", [10, 11, 50])
+def test_lttb_threshold_at_or_above_length_keeps_everything(threshold):
+    t, v = _series(10)
+    assert history.lttb(t, v, threshold).tolist() == list(range(10))
+
+
+@pytest.mark.parametrize("n, threshold", [(100, 3), (100, 10), (1000, 300), (7, 5)])
+def test_lttb_selection(n, threshold):
+    t, v = _series(n)
+    idx = history.lttb(t, v, threshold)
+    assert len(idx) == threshold
+    assert idx[0] == 0 and idx[-1] == n - 1
+    assert np.all(np.diff(idx) > 0)
+
+
+def test_lttb_keeps_spike():
+    t = np.arange(100, dtype=np.float64)
+    v = np.zeros(100)
+    v[42] = 1000
+    assert 42 in history.lttb(t, v, 10).tolist()
+
+
+def test_append_skips_non_finite_points():
+    result = history.append_points("client", [
+        (10_000, 1.0), (20_000, float("inf")), (30_000, float("nan")),
+        (float("inf"), 2.0), (40_000, 3.0),
+    ])
+    assert result == {"stored": 2, "skipped": 3}
+    data = history.query("client")
+    assert data["points"] == [{"timestamp": 10000, "value": 1.0}, {"timestamp": 40000, "value": 3.0}]
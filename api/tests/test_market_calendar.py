@@ -0,0 +1,92 @@
+from datetime import date, datetime, timezone
+
+import pytest
+
+from app.services import market_calendar as mc
+
+
+def utc(*args):
+    return datetime(*args, tzinfo=timezone.utc)
+
+
+@pytest.mark.parametrize("year, expected", [
+    (2000, date(2000, 4, 23)),
+    (2024, date(2024, 3, 31)),
+    (2025, date(2025, 4, 20)),
+    (2026, date(2026, 4, 5)),
+])
+def test_easter(year, expected):
+    assert mc._easter(year) == expected
+
+
+@pytest.mark.parametrize("day, expected", [
+    (date(2026, 7, 4), date(2026, 7, 3)),     # Saturday -> Friday
+    (date(2027, 7, 4), date(2027, 7, 5)),     # Sunday -> Monday
+    (date(2026, 12, 25), date(2026, 12, 25)),  # weekday unchanged
+])
+def test_observed(day, expected):
+    assert mc._observed(day) == expected
+
+
+def test_us_holidays():
+    days = mc.holidays("US", 2026)
+    assert date(2026, 4, 3) in days    # Good Friday
+    assert date(2026, 7, 3) in days    # Independence Day observed
+    assert date(2026, 11, 26) in days  # Thanksgiving
+    # New Year's Day 2022 fell on a Saturday and was not observed on Friday
+    assert date(2021, 12, 31) not in mc.holidays("US", 2021)
+
+
+@pytest.mark.parametrize("symbol, exchange", [
+    ("AAPL", "US"), ("BRK.B", "US"), ("BF.A", "US"), ("^GSPC", "US"),
+    ("PTT.BK", "SET"), ("VOD.L", "LSE"), ("7203.T", "TSE"),
+    ("0700.HK", "HKEX"), ("^HSI", "HKEX"), ("BHP.AX", "ASX"), ("SAP.DE", "XETRA"),
+    ("BTC-USD", "CRYPTO"), ("EURUSD=X", "FX"), ("GC=F", "FX"),
+    ("005930.KS", None), ("^STOXX50E", None), ("ABC.V", None), ("SAP.F", None),
+])
+def test_exchange_for_symbol(symbol, exchange):
+    assert mc.exchange_for_symbol(symbol) == exchange
+
+
+def test_us_weekend_waits_for_monday_open():
+    # Saturday 08:00 EDT -> Monday 09:30 EDT
+    assert mc.seconds_until_open("US", utc(2026, 10, 17, 12, 0)) == (2 * 24 + 1.5) * 3600
+
+
+def test_us_holiday_is_closed():
+    assert not mc.is_open("US", utc(2026, 4, 3, 15, 0))  # Good Friday 11:00 EDT
+
+
+def test_lunch_breaks():
+    # 12:00 JST: Tokyo lunch break, reopens 12:30
+    assert not mc.is_open("TSE", utc(2026, 10, 20, 3, 0))
+    assert mc.seconds_until_open("TSE", utc(2026, 10, 20, 3, 0)) == 1800
+    # 12:30 HKT: Hong Kong lunch break, reopens 13:00
+    assert mc.seconds_until_open("HKEX", utc(2026, 10, 20, 4, 30)) == 1800
+    # 14:00 ICT: Bangkok afternoon session starts 14:30
+    assert mc.seconds_until_open("SET", utc(2026, 10, 20, 7, 0)) == 1800
+
+
+def test_fx_weekly_window():
+    assert mc.is_open("FX", utc(2026, 10, 16, 20, 0))       # Friday 16:00 EDT
+    assert not mc.is_open("FX", utc(2026, 10, 16, 21, 0))   # Friday 17:00 EDT
+    assert not mc.is_open("FX", utc(2026, 10, 17, 12, 0))   # Saturday
+    assert mc.seconds_until_open("FX", utc(2026, 10, 18, 20, 0)) == 3600  # Sunday 16:00 EDT
+    assert mc.is_open("FX", utc(2026, 10, 20, 3, 0))        # Tuesday night
+
+
+def test_cache_ttl_while_asian_markets_trade():
+    now = utc(2026, 10, 20, 3, 0)  # Tuesday 11:00 HKT, 14:00 AEDT, 05:00 CEST, 23:00 EDT
+    assert mc.cache_ttl("0700.HK", 15, now=now) == 15
+    assert mc.cache_ttl("^HSI", 15, now=now) == 15
+    assert mc.cache_ttl("BHP.AX", 15, now=now) == 15
+    assert mc.cache_ttl("005930.KS", 15, now=now) == 15  # unknown exchange
+    assert mc.cache_ttl("SAP.DE", 15, now=now) == 4 * 3600  # until 09:00 CEST
+    assert mc.cache_ttl("AAPL", 15, now=now) == 10.5 * 3600  # until 09:30 EDT
+    assert mc.cache_ttl("AAPL", 15, closed_max_ttl=900, now=now) == 900
+    assert mc.cache_ttl("BTC-USD", 15, now=now) == 15
+
+
+def test_cache_ttl_close_grace():
+    assert mc.cache_ttl("AAPL", 15, now=utc(2026, 10, 20, 20, 5)) == 15  # 16:05 EDT
+    assert mc.cache_ttl("AAPL", 15, now=utc(2026, 10, 20, 20, 30)) > 15  # 16:30 EDT
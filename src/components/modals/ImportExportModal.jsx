@@ -1,5 +1,6 @@
 import { useState, useEffect } from 'react';
 import { X, Copy, Download, Upload, AlertTriangle, Check, FileJson } from 'lucide-react';
+import { resolveSymbols } from '../../services/api';
 
 export default function ImportExportModal({ isOpen, onClose, assets, onImport }) {
     const [mode, setMode] = useState('EXPORT'); // EXPORT | IMPORT
@@ -33,21 +34,41 @@ export default function ImportExportModal({ isOpen, onClose, assets, onImport })
         setMessage({ type: 'success', text: 'File downloaded!' });
     };
 
-    const handleImportSubmit = () => {
+    const handleImportSubmit = async () => {
         if (!jsonContent.trim()) {
             setMessage({ type: 'error', text: 'Please paste JSON data first.' });
             return;
         }
 
-        const result = onImport(jsonContent);
-        if (result.success) {
-            setMessage({ type: 'success', text: 'Data imported successfully!' });
-            setTimeout(() => {
-                onClose();
-            }, 1000);
-        } else {
+        let parsed;
+        try {
+            parsed = JSON.parse(jsonContent);
+        } catch (error) {
+            setMessage({ type: 'error', text: `Invalid JSON: ${error.message}` });
+            return;
+        }
+
+        const result = onImport(parsed);
+        if (!result.success) {
             setMessage({ type: 'error', text: result.message || 'Import failed' });
+            return;
+        }
+
+        // Check every imported ticker in one batch call instead of one lookup per symbol
+        const symbols = parsed.filter(a => a.category === 'Investment' && a.symbol).map(a => a.symbol);
+        const resolution = await resolveSymbols(symbols);
+        const unknown = resolution
+            ? [...new Set(resolution.results.filter(r => r.status === 'unresolved').map(r => r.query))]
+            : [];
+
+        if (unknown.length > 0) {
+            setMessage({ type: 'error', text: `Data imported, but these symbols were not recognised: ${unknown.join(', ')}` });
+            return;
         }
+        setMessage({ type: 'success', text: 'Data imported successfully!' });
+        setTimeout(() => {
+            onClose();
+        }, 1000);
     };
 
     const handleFileUpload = (e) => {
@@ -1,6 +1,6 @@
 import { useState, useEffect, useMemo, useCallback } from 'react';
 import { consolidateAssets, calculateTotalTHB, formatCurrency, isMarketOpen } from '../utils/helpers';
-import { fetchLivePrices } from '../services/api';
+import { fetchLivePrices, getClientId, savePortfolioHistory, fetchPortfolioHistory } from '../services/api';
 import { ASSET_DB } from '../constants/assets';
 import { getAssets, saveAssets, getHistory, saveHistoryPoint, trimHistory, migrateFromLocalStorage } from '../utils/storage';
 
@@ -11,6 +11,10 @@ const DEFAULT_ASSETS = [
     { id: 3, name: 'Apple Inc.', symbol: 'AAPL', type: 'Stock', quantity: 10, price: 185.50, exchangeRate: 35.50, currency: 'USD', category: 'Investment' },
 ];
 
+// The server keeps the full history; locally we only keep a short offline copy
+const LOCAL_HISTORY_POINTS = 50;
+const CHART_HISTORY_POINTS = 300;
+
 export function usePortfolio() {
     // 1. Base State - Initialize from localStorage first (sync), then load from IndexedDB (async)
     const [assets, setAssets] = useState(() => {
@@ -48,6 +52,18 @@ export function usePortfolio() {
                 if (savedHistory && savedHistory.length > 0) {
                     setHistory(savedHistory);
                 }
+
+                // Prefer the server-side history (downsampled) without blocking the initial render;
+                // upload the local one if the server has none yet
+                const clientId = getClientId();
+                fetchPortfolioHistory(clientId, { points: CHART_HISTORY_POINTS }).then(serverHistory => {
+                    if (serverHistory.length > 0) {
+                        const lastServerTs = serverHistory[serverHistory.length - 1].timestamp;
+                        setHistory(prev => [...serverHistory, ...prev.filter(p => p.timestamp > lastServerTs)]);
+                    } else if (savedHistory && savedHistory.length > 0) {
+                        savePortfolioHistory(clientId, savedHistory);
+                    }
+                });
             } catch (error) {
                 console.warn('IndexedDB initialization failed, using localStorage:', error);
             } finally {
@@ -72,12 +88,12 @@ export function usePortfolio() {
     useEffect(() => {
         if (isLoading) return;
 
-        // Save to localStorage
-        localStorage.setItem('portfolioHistory_v1', JSON.stringify(history));
+        // Save the recent points to localStorage as an offline copy
+        localStorage.setItem('portfolioHistory_v1', JSON.stringify(history.slice(-LOCAL_HISTORY_POINTS)));
 
         // Trim history in IndexedDB periodically
-        if (history.length > 50) {
-            trimHistory(50).catch(console.error);
+        if (history.length > LOCAL_HISTORY_POINTS) {
+            trimHistory(LOCAL_HISTORY_POINTS).catch(console.error);
         }
     }, [history, isLoading]);
 
@@ -107,7 +123,7 @@ export function usePortfolio() {
 
                 const priceData = prices[lookupKey];
 
-                if (priceData && typeof priceData === 'object') {
+                if (priceData && typeof priceData === 'object' && !['unavailable', 'missing'].includes(priceData.status)) {
                     const marketPrice = priceData.price;
                     const previousClose = priceData.previousClose;
                     let marketChange = priceData.change;
@@ -161,16 +177,18 @@ export function usePortfolio() {
     // Update History on Value Change
     useEffect(() => {
         if (grandTotalTHB > 0) {
-            setHistory(prev => {
-                const now = Date.now();
-                const newPoint = { timestamp: now, value: grandTotalTHB };
+            const newPoint = { timestamp: Date.now(), value: grandTotalTHB };
+            // The server drops snapshots closer than HISTORY_MIN_INTERVAL to the previous one
+            if (!isLoading) savePortfolioHistory(getClientId(), [newPoint]);
 
+            setHistory(prev => {
                 // Limit history length
                 const updated = [...prev, newPoint];
-                if (updated.length > 50) return updated.slice(updated.length - 50);
+                if (updated.length > CHART_HISTORY_POINTS) return updated.slice(updated.length - CHART_HISTORY_POINTS);
                 return updated;
             });
         }
+        // eslint-disable-next-line react-hooks/exhaustive-deps
     }, [grandTotalTHB]);
 
     // 6. Complex Stats Calculation
@@ -39,7 +39,9 @@ const NewsPage = ({ aiLanguage = 'en', aiModel = 'qwen/qwen3-32b' }) => {
                 news: news.map(item => ({
                     title: item.title,
                     publisher: item.publisher || "Unknown",
-                    link: item.link
+                    link: item.link,
+                    summary: item.summary,
+                    sourceCount: item.sourceCount || 1
                 })),
                 language: aiLanguage,
                 model: aiModel
@@ -349,6 +351,9 @@ const NewsPage = ({ aiLanguage = 'en', aiModel = 'qwen/qwen3-32b' }) => {
                                                         <span className="font-medium text-slate-700 dark:text-slate-300">{item.publisher}</span>
                                                     </>
                                                 )}
+                                                {item.sourceCount > 1 && (
+                                                    <span title={(item.publishers || []).join(', ')}>+{item.sourceCount - 1} sources</span>
+                                                )}
                                             </div>
 
                                             <a
@@ -3,26 +3,50 @@ import { ASSET_DB } from '../constants/assets';
 const API_BASE_URL = 'http://localhost:8000';
 const API_ASSETS_BASE_URL = `${API_BASE_URL}/api`;
 
+// Anonymous per-browser id; scopes server-side caches (e.g. portfolio analyses) to this user
+export const getClientId = () => {
+    let id = localStorage.getItem('clientId_v1');
+    if (!id) {
+        id = window.crypto?.randomUUID ? window.crypto.randomUUID() : `${Date.now()}-${Math.random().toString(36).slice(2)}`;
+        localStorage.setItem('clientId_v1', id);
+    }
+    return id;
+};
+
+// Must match MAX_PRICE_SYMBOLS on the backend
+const MAX_PRICE_SYMBOLS = 100;
+
 export const fetchLivePrices = async (assets) => {
-    const symbolsToFetch = assets
+    const symbolsToFetch = [...new Set(assets
         .filter(a => a.category === 'Investment')
         .map(a => {
             // Check if there's a specific yfinance symbol override in ASSET_DB
             const dbEntry = ASSET_DB[a.symbol];
             return dbEntry && dbEntry.yfSymbol ? dbEntry.yfSymbol : a.symbol;
-        });
+        }))];
 
     if (symbolsToFetch.length === 0) return {};
 
-    try {
-        const query = symbolsToFetch.join(',');
-        const response = await fetch(`${API_ASSETS_BASE_URL}/prices?symbols=${query}`);
-        if (!response.ok) throw new Error('Network response was not ok');
-        return await response.json();
-    } catch (error) {
-        console.error("Failed to fetch prices:", error);
-        return null;
+    const batches = [];
+    for (let i = 0; i < symbolsToFetch.length; i += MAX_PRICE_SYMBOLS) {
+        batches.push(symbolsToFetch.slice(i, i + MAX_PRICE_SYMBOLS));
     }
+
+    const results = await Promise.all(batches.map(async (batch) => {
+        try {
+            const query = batch.map(encodeURIComponent).join(',');
+            const response = await fetch(`${API_ASSETS_BASE_URL}/prices?symbols=${query}`);
+            if (!response.ok) throw new Error('Network response was not ok');
+            return await response.json();
+        } catch (error) {
+            console.error("Failed to fetch prices:", error);
+            return null;
+        }
+    }));
+
+    // Partial results are still useful; only fail when every batch failed
+    if (results.every(r => r === null)) return null;
+    return Object.assign({}, ...results.filter(Boolean));
 };
 
 export const searchAssets = async (query) => {
@@ -49,6 +73,23 @@ export const getAssetInfo = async (symbol) => {
     }
 };
 
+// Resolve many raw symbols / company names at once (portfolio import)
+export const resolveSymbols = async (symbols) => {
+    if (!symbols || symbols.length === 0) return { results: [], resolved: 0, unresolved: 0 };
+    try {
+        const response = await fetch(`${API_ASSETS_BASE_URL}/symbols/resolve`, {
+            method: 'POST',
+            headers: { 'Content-Type': 'application/json' },
+            body: JSON.stringify({ symbols })
+        });
+        if (!response.ok) throw new Error('Failed to resolve symbols');
+        return await response.json();
+    } catch (error) {
+        console.error("Error resolving symbols:", error);
+        return null;
+    }
+};
+
 // --- News API ---
 export const fetchNews = async (category, page, symbol = null) => {
     let url = `${API_ASSETS_BASE_URL}/news?category=${category}&page=${page}`;
@@ -91,7 +132,7 @@ export const analyzePortfolio = async (payload) => {
     const response = await fetch(`${API_BASE_URL}/analyze`, {
         method: 'POST',
         headers: { 'Content-Type': 'application/json' },
-        body: JSON.stringify(payload)
+        body: JSON.stringify({ clientId: getClientId(), ...payload })
     });
     if (!response.ok) {
         const err = await response.json();
@@ -125,3 +166,75 @@ export const getEconomicCalendar = async () => {
         return [];
     }
 };
+
+// --- Price Alerts API ---
+export const createAlert = async (payload) => {
+    const response = await fetch(`${API_ASSETS_BASE_URL}/alerts`, {
+        method: 'POST',
+        headers: { 'Content-Type': 'application/json' },
+        body: JSON.stringify(payload)
+    });
+    if (!response.ok) {
+        const err = await response.json();
+        throw new Error(err.detail || "Failed to create alert");
+    }
+    return await response.json();
+};
+
+export const listAlerts = async (clientId) => {
+    try {
+        const response = await fetch(`${API_ASSETS_BASE_URL}/alerts?clientId=${encodeURIComponent(clientId)}`);
+        if (!response.ok) return [];
+        return await response.json();
+    } catch (error) {
+        console.error("Error listing alerts:", error);
+        return [];
+    }
+};
+
+export const deleteAlert = async (clientId, alertId) => {
+    const response = await fetch(`${API_ASSETS_BASE_URL}/alerts/${alertId}?clientId=${encodeURIComponent(clientId)}`, {
+        method: 'DELETE'
+    });
+    if (!response.ok) throw new Error('Failed to delete alert');
+    return await response.json();
+};
+
+// Returns the EventSource; call .close() to unsubscribe
+export const subscribeAlerts = (clientId, onAlert) => {
+    const source = new EventSource(`${API_ASSETS_BASE_URL}/alerts/stream?clientId=${encodeURIComponent(clientId)}`);
+    source.addEventListener('alert', (e) => onAlert(JSON.parse(e.data)));
+    return source;
+};
+
+// --- Portfolio History API ---
+export const savePortfolioHistory = async (clientId, points) => {
+    try {
+        const response = await fetch(`${API_ASSETS_BASE_URL}/history`, {
+            method: 'POST',
+            headers: { 'Content-Type': 'application/json' },
+            body: JSON.stringify({ clientId, points })
+        });
+        if (!response.ok) return null;
+        return await response.json();
+    } catch (error) {
+        console.error("Error saving history:", error);
+        return null;
+    }
+};
+
+// Range is in unix ms; the server downsamples to at most `points` points
+export const fetchPortfolioHistory = async (clientId, { start, end, points = 300 } = {}) => {
+    try {
+        const params = new URLSearchParams({ clientId, points });
+        if (start != null) params.append('start', start);
+        if (end != null) params.append('end', end);
+        const response = await fetch(`${API_ASSETS_BASE_URL}/history?${params}`);
+        if (!response.ok) return [];
+        const data = await response.json();
+        return data.points;
+    } catch (error) {
+        console.error("Error fetching history:", error);
+        return [];
+    }
+};